@@ -1,11 +1,263 @@
-import ccxt
+import atexit
 import time
 import threading
 import json
+import logging
+import math
 import os
+import queue
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Union, Optional
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterable, List, NamedTuple, Optional
 import argparse
+import asyncio
+import csv
+import gzip
+import sys
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace requests to the exchange."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate  # tokens refilled per second
+        self.burst = burst
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, cost: float = 1):
+        """Reserve `cost` tokens, sleeping until the reserved slot arrives."""
+        with self._lock:
+            self._refill()
+            self._tokens -= cost
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+    def wait_time(self, cost: float = 1) -> float:
+        """Seconds an acquire(cost) made now would sleep; reserves nothing."""
+        with self._lock:
+            self._refill()
+            return max(0.0, (cost - self._tokens) / self.rate)
+
+
+class BackgroundWriter:
+    """Writes and flushes files to stable storage on a daemon thread."""
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._pending = {}  # path -> newest text still to be written
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, path: str):
+        """Queue `path` for fsync and return immediately."""
+        self._queue.put(path)
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, daemon=True)
+                    self._thread.start()
+                    # Don't lose queued writes when the process exits
+                    atexit.register(self.flush)
+
+    def replace(self, path: str, text: str):
+        """Queue an atomic replace of `path` with `text`, then its fsync."""
+        with self._lock:
+            # Saves made before the writer catches up collapse into the last
+            self._pending[path] = text
+        self.submit(path)
+
+    def flush(self):
+        """Block until everything queued so far is written and synced."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            # A burst of saves to the same file needs only one write and fsync
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            paths = {item for item in items if isinstance(item, str)}
+            for path in paths:
+                with self._lock:
+                    text = self._pending.pop(path, None)
+                if text is not None:
+                    try:
+                        tmp_path = path + ".tmp"
+                        with open(tmp_path, "w") as f:
+                            f.write(text)
+                        os.replace(tmp_path, path)
+                    except OSError as e:
+                        print(f"Error writing {path}: {e}")
+            # Sync each file's contents, then its directory so the rename
+            # that installed it survives a power loss too (POSIX only)
+            directories = set()
+            if os.name == "posix":
+                directories = {os.path.dirname(os.path.abspath(p)) for p in paths}
+            for path in [*paths, *directories]:
+                try:
+                    fd = os.open(path, os.O_RDONLY)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+                except OSError as e:
+                    print(f"Error syncing {path}: {e}")
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+
+# How long loaded or disk-cached markets are trusted before reloading (seconds)
+MARKETS_CACHE_TTL = 24 * 60 * 60
+
+# Keep-alive pools for the exchange's API hosts, and warm connections per host
+HTTP_POOL_HOSTS = 10
+HTTP_POOL_SIZE = 50
+
+# Order side that closes a position of each side
+CLOSE_SIDE = {"long": "sell", "short": "buy"}
+
+# Record fields whose values repeat across trades and positions
+INTERNED_FIELDS = frozenset(("symbol", "side", "status", "order_type", "margin_mode"))
+
+# ccxt market types listed as tradable futures
+FUTURES_MARKET_TYPES = frozenset(("swap", "future"))
+
+# Exchange attributes set_markets fills in; traders on the same exchange
+# share one parsed copy of them per process
+MARKET_ATTRS = (
+    "markets",
+    "markets_by_id",
+    "symbols",
+    "ids",
+    "currencies",
+    "currencies_by_id",
+    "baseCurrencies",
+    "quoteCurrencies",
+    "codes",
+)
+_shared_markets = {}  # exchange_id -> (attrs, monotonic expiry, from disk)
+_shared_markets_lock = threading.Lock()
+
+# The journal is compacted after this many status events
+JOURNAL_COMPACT_EVENTS = 50
+
+# Most recent trades and closed positions included in a status payload.
+# Older trades are paged through /api/trades; the totals say how many exist.
+STATUS_TRADES_LIMIT = 50
+
+# ccxt order statuses that settle a pending trade, and the status recorded
+ORDER_STATUS_MAP = {
+    "closed": "filled",
+    "canceled": "canceled",
+    "expired": "canceled",
+    "rejected": "canceled",
+}
+
+# Rejection codes returned by CryptoFuturesTrader._can_trade_fast()
+TRADE_ALLOWED = 0
+REJECT_MAX_TRADES = 1
+REJECT_COOLDOWN = 2
+REJECT_LOSS_LIMIT = 3
+
+REJECT_REASONS = {
+    REJECT_MAX_TRADES: "Max daily trades ({max_trades}) reached",
+    REJECT_COOLDOWN: "Cooldown period active. Wait {wait_mins:.1f} more minutes",
+    REJECT_LOSS_LIMIT: "Daily loss limit (${max_loss}) reached",
+}
+
+
+class TradeDecision(NamedTuple):
+    """Result of CryptoFuturesTrader.can_trade()."""
+
+    allowed: bool
+    reason: str
+
+
+# Shared result for the common allowed case
+ALLOWED_DECISION = TradeDecision(True, "Trading allowed")
+
+# Exchange error substrings (lowercase) mapped to user-facing messages,
+# checked in order by place_trade
+_ERR_MAP = (
+    ("balance", "Insufficient balance. Error: {error}"),
+    (
+        "permission",
+        "API permission issue. Make sure your API key has trading permissions. Error: {error}",
+    ),
+    (
+        "symbol",
+        "Symbol error. The pair {symbol} may not be available for futures trading. Error: {error}",
+    ),
+)
+
+
+_monitor_loop_lock = threading.Lock()
+_monitor_event_loop = None
+
+
+def _monitor_loop() -> asyncio.AbstractEventLoop:
+    """Event loop shared by every trader's monitor, run on one daemon thread."""
+    global _monitor_event_loop
+    with _monitor_loop_lock:
+        if _monitor_event_loop is None:
+            _monitor_event_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_monitor_event_loop.run_forever,
+                name="position-monitor",
+                daemon=True,
+            ).start()
+        return _monitor_event_loop
+
+
+# Monitor and close output goes through a queue so neither the monitor
+# thread nor concurrent closes block on stdout; see _start_log_listener()
+MONITOR_LOG = logging.getLogger("coinex_trader.monitor")
+CLOSE_LOG = logging.getLogger("coinex_trader.close")
+
+
+@lru_cache(maxsize=None)
+def _start_log_listener() -> QueueListener:
+    """Route the queued loggers through a background listener (once)."""
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    listener.start()
+    atexit.register(listener.stop)
+    for logger in (MONITOR_LOG, CLOSE_LOG):
+        logger.addHandler(QueueHandler(log_queue))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return listener
+
+
+@lru_cache(maxsize=1024)
+def _normalize_symbol(symbol: str) -> str:
+    """Canonical BASE/USDT form of a symbol, used to key pending_monitors."""
+    # Remove common variations
+    normalized = symbol.replace(":USDT", "").replace("/USDT", "").replace("USDT", "")
+    # Add back /USDT format
+    if "/" not in normalized:
+        normalized = normalized + "/USDT"
+    return normalized
 
 
 class CryptoFuturesTrader:
@@ -25,31 +277,79 @@ class CryptoFuturesTrader:
         # State tracking
         self.daily_trade_count = 0
         self.daily_pnl = 0.0
-        self.last_trade_time = None
+        self.last_trade_time = None  # Wall-clock time, for display and day rollover
+        self.last_trade_time_ts = 0.0  # Same instant as a POSIX timestamp
+        self._last_trade_monotonic = None  # Monotonic time, for cooldown math
         self.trades_history = []
+        self.history_version = 0  # Bumped whenever trades_history changes
+        self._trade_times = array("d")  # POSIX time of each trades_history entry
+        self._today_start_idx = 0  # First trades_history entry placed today
+        self._today_start_ts = 0.0  # POSIX time the trading day began
+        self._filled_today = 0  # Filled trades placed today, kept incrementally
+        self._orders_by_id = {}  # order_id -> trades_history entry
+        # Limit orders still awaiting a fill, order_id -> trade in placement order
+        self._pending_limit_trades = {}
+        self._trading_day = datetime.now().date()
+        self.position_history = []  # Closed positions with PnL details
         self.config_path = config_path
         self.exchange_id = exchange_id.lower()
-
-        # Initialize exchange connection
-        self.exchange = self._initialize_exchange(exchange_id, api_key, secret_key)
+        self._is_coinex = self.exchange_id == "coinex"
+        # Exchange-specific order handling, chosen once per trader
+        if self._is_coinex:
+            self._order_params = self._coinex_order_params
+            self._submit_settings = self._submit_coinex_settings
+            self._close_params = {"reduceOnly": True}
+        else:
+            self._order_params = self._generic_order_params
+            self._submit_settings = self._submit_generic_settings
+            self._close_params = {"reduceOnly": True, "type": "future"}
+
+        # Append-only journal of trades, status changes and closed positions;
+        # the config file itself only holds the small counters header
+        self._journal_path = config_path + ".jsonl"
+        self._journal = None
+        self._journal_stale = 0  # Status events not yet folded into trades
+        # Serializes journal writes between request threads and the monitor
+        self._journal_lock = threading.RLock()
+        # Settled trades from earlier days, moved out of memory at rollover
+        self._archive_path = config_path + ".archive.jsonl.gz"
+        self._writer = BackgroundWriter()
+
+        # Last (leverage, margin_mode) applied per exchange symbol
+        self._leverage_cache = {}
+
+        # The exchange client and its markets are created on first use, so
+        # commands that only read local state never import or contact ccxt
+        self._credentials = (exchange_id, api_key, secret_key)
+        self._exchange = None
+        self._exchange_lock = threading.Lock()
+        self._markets_loaded = False
+        self._markets_expire = 0.0  # Monotonic time after which to reload markets
+        self._markets_from_disk = False
+        self._markets_cache_path = os.path.join(
+            os.path.dirname(config_path), f".markets_{self.exchange_id}.json"
+        )
+        self._market_id_upper = {}
+        self._symbol_cache = {}
+        self._market_cache = {}
+        self._futures_markets = None
 
         # Load state if exists
         self._load_state()
 
         # Monitoring system
         self.monitoring_active = False
-        self.monitor_thread = None
+        self._monitor_task = None  # Future of _monitor_positions on the monitor loop
         self.pending_monitors = {}  # Store SL/TP targets for positions
+        # Guards pending_monitors between request threads and the monitor
+        self._monitors_lock = threading.Lock()
         self.check_interval = 5  # Check positions every 5 seconds
+        self.log = MONITOR_LOG
 
-        # State tracking
-        self.daily_trade_count = 0
-        self.daily_pnl = 0.0
-        self.last_trade_time = None
-        self.trades_history = []
-        self.position_history = []  # Add this line to track closed positions
-        self.config_path = config_path
-        self.exchange_id = exchange_id.lower()
+        # Worker pool for issuing independent exchange calls concurrently
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="exchange-io"
+        )
 
     def record_closed_position(
         self, symbol, side, size, entry_price, exit_price, realized_pnl, fees
@@ -66,7 +366,9 @@ class CryptoFuturesTrader:
             "fees": fees,
         }
 
-        self.position_history.append(position_record)
+        with self._journal_lock:
+            self.position_history.append(position_record)
+            self._journal_event({"event": "position", "position": position_record})
         print(
             f"Recorded closed position: {side} {symbol} with PNL: {realized_pnl} USDT"
         )
@@ -81,24 +383,15 @@ class CryptoFuturesTrader:
         """
         try:
             # Find pending limit orders to check
-            pending_orders = []
-
             if order_id:
                 # Check specific order
-                for trade in self.trades_history:
-                    if (
-                        trade.get("order_id") == order_id
-                        and trade.get("status") == "pending"
-                    ):
-                        pending_orders.append(trade)
+                trade = self._orders_by_id.get(order_id)
+                pending_orders = (
+                    [trade] if trade and trade.get("status") == "pending" else []
+                )
             else:
                 # Check all pending orders
-                for trade in self.trades_history:
-                    if (
-                        trade.get("status") == "pending"
-                        and trade.get("order_type") == "limit"
-                    ):
-                        pending_orders.append(trade)
+                pending_orders = list(self._pending_limit_trades.values())
 
             if not pending_orders:
                 return {"success": True, "message": "No pending orders to check"}
@@ -107,36 +400,37 @@ class CryptoFuturesTrader:
 
             # Check each pending order
             updated_orders = []
+            statuses = self._fetch_order_statuses(
+                [
+                    trade
+                    for trade in pending_orders
+                    if trade.get("order_id") and trade.get("order_id") != "unknown"
+                ]
+            )
 
             for trade in pending_orders:
                 order_id = trade.get("order_id")
-                if not order_id or order_id == "unknown":
+                if order_id not in statuses:
                     continue
 
                 try:
-                    # Fetch the order status from the exchange
-                    order = self.exchange.fetch_order(order_id, trade.get("symbol"))
-                    print(f"Order {order_id} status: {order.get('status')}")
+                    status = statuses[order_id]
+                    print(f"Order {order_id} status: {status}")
 
-                    # Update the order status
-                    if (
-                        order.get("status") == "closed"
-                        or order.get("status") == "filled"
-                    ):
-                        trade["status"] = "filled"
-                        self.daily_trade_count += 1
-                        self.last_trade_time = datetime.now()
+                    # Update the order status, unless the order stream or
+                    # another poll settled it while the statuses were fetched
+                    if status == "closed" or status == "filled":
+                        if not self._settle_pending(trade, "filled"):
+                            continue
                         updated_orders.append(
                             {"order_id": order_id, "status": "filled"}
                         )
                         print(
                             f"Limit order {order_id} is now filled - counted as trade #{self.daily_trade_count}"
                         )
-                    elif (
-                        order.get("status") == "canceled"
-                        or order.get("status") == "cancelled"
-                    ):
-                        trade["status"] = "canceled"
+                    elif status == "canceled" or status == "cancelled":
+                        if not self._settle_pending(trade, "canceled"):
+                            continue
                         updated_orders.append(
                             {"order_id": order_id, "status": "canceled"}
                         )
@@ -164,32 +458,80 @@ class CryptoFuturesTrader:
                 "message": f"Error checking limit orders: {str(e)}",
             }
 
+    def _fetch_order_statuses(self, trades: List[Dict]) -> Dict[str, str]:
+        """
+        Fetch the exchange status of each trade's order, keyed by order id.
+        Several orders on one symbol are resolved from that symbol's open
+        (then closed) order lists; the rest fall back to fetch_order.
+        """
+        by_symbol = {}
+        for trade in trades:
+            by_symbol.setdefault(trade.get("symbol"), []).append(trade["order_id"])
+
+        statuses = {}
+        for symbol, order_ids in by_symbol.items():
+            unresolved = set(order_ids)
+            try:
+                if len(order_ids) > 1 and self._has_fetch_open_orders:
+                    for order in self._api("fetch_open_orders", symbol):
+                        if order.get("id") in unresolved:
+                            statuses[order["id"]] = order.get("status")
+                            unresolved.discard(order["id"])
+                    if unresolved and self._has_fetch_closed_orders:
+                        for order in self._api("fetch_closed_orders", symbol):
+                            if order.get("id") in unresolved:
+                                statuses[order["id"]] = order.get("status")
+                                unresolved.discard(order["id"])
+            except Exception as e:
+                print(f"Error listing orders for {symbol}: {e}")
+
+            for order_id in unresolved:
+                try:
+                    order = self._api("fetch_order", order_id, symbol)
+                    statuses[order_id] = order.get("status")
+                except Exception as e:
+                    print(f"Error checking order {order_id}: {e}")
+        return statuses
+
+    def _settle_pending(self, trade: Dict, status: str) -> bool:
+        """Move a pending trade to `status`; False if it was already settled.
+
+        The order stream, the background poller and explicit checks can all
+        see the same fill, so the check and the transition share the journal
+        lock and only the first of them counts the trade.
+        """
+        with self._journal_lock:
+            if trade.get("status") != "pending":
+                return False
+            self._set_order_status(trade, status)
+            if status == "filled":
+                self._mark_trade(datetime.now())
+        return True
+
     def update_order_status(self, order_id, new_status):
         """Update the status of an order and handle filled orders."""
-        updated = False
+        trade = self._orders_by_id.get(order_id)
+        updated = trade is not None
 
-        for trade in self.trades_history:
-            if trade.get("order_id") == order_id:
+        if updated:
+            with self._journal_lock:
                 old_status = trade.get("status")
-                trade["status"] = new_status
-                updated = True
-
-                # If this is a limit order being marked as filled
-                if old_status == "pending" and new_status == "filled":
-                    self.last_trade_time = datetime.now()
-                    self.daily_trade_count += 1
-                    print(
-                        f"Limit order {order_id} marked as filled - counted as trade #{self.daily_trade_count}"
-                    )
+                if old_status == "pending":
+                    self._settle_pending(trade, new_status)
+                elif old_status != new_status:
+                    self._set_order_status(trade, new_status)
 
-                # If this is an order being marked as canceled
-                elif new_status == "canceled":
-                    print(
-                        f"Order {order_id} marked as canceled - not counted as a trade"
-                    )
+            # If this is a limit order being marked as filled
+            if old_status == "pending" and new_status == "filled":
+                print(
+                    f"Limit order {order_id} marked as filled - counted as trade #{self.daily_trade_count}"
+                )
 
-                self._save_state()
-                break
+            # If this is an order being marked as canceled
+            elif new_status == "canceled":
+                print(f"Order {order_id} marked as canceled - not counted as a trade")
+
+            self._save_state()
 
         return {
             "success": updated,
@@ -203,177 +545,266 @@ class CryptoFuturesTrader:
     def start_monitoring(self):
         """Start the position monitoring system"""
         if not self.monitoring_active:
+            _start_log_listener()
             self.monitoring_active = True
-            self.monitor_thread = threading.Thread(target=self._monitor_positions)
-            self.monitor_thread.daemon = (
-                True  # Thread will stop when main program stops
+            self._monitor_task = asyncio.run_coroutine_threadsafe(
+                self._monitor_positions(), _monitor_loop()
             )
-            self.monitor_thread.start()
             print("Position monitoring system started")
 
     def stop_monitoring(self):
         """Stop the position monitoring system"""
         self.monitoring_active = False
-        if self.monitor_thread:
-            self.monitor_thread.join()
+        if self._monitor_task:
+            # The monitor notices within one check interval and exits
+            try:
+                self._monitor_task.result()
+            except Exception as e:
+                print(f"Monitor stopped with error: {e}")
+            self._monitor_task = None
         print("Position monitoring system stopped")
 
-    def _monitor_positions(self):
-        """Background thread that monitors positions for SL/TP"""
+    async def _monitor_positions(self):
+        """Monitor positions for SL/TP on the shared monitor event loop"""
+        ws_exchange = await asyncio.to_thread(self._create_ws_exchange)
+        if ws_exchange is not None:
+            try:
+                await self._monitor_positions_ws(ws_exchange)
+            except Exception as e:
+                self.log.warning(
+                    "Websocket monitor error, falling back to polling: %s", e
+                )
+        await self._monitor_positions_rest()
+
+    def _create_ws_exchange(self):
+        """Return a ccxt.pro client that can stream tickers, or None."""
+        try:
+            import ccxt.pro as ccxtpro
+
+            exchange = getattr(ccxtpro, self.exchange_id)(
+                self._exchange_config(*self._credentials[1:])
+            )
+        except (ImportError, AttributeError) as e:
+            self.log.warning("Websocket monitoring unavailable: %s", e)
+            return None
+        if not exchange.has.get("watchTickers"):
+            return None
+        return exchange
+
+    @staticmethod
+    def _close_reason(position: Dict, monitor: Dict, current_price: float):
+        """Return why a monitored position should be closed, or None."""
+        pnl = float(position.get("unrealizedPnl") or 0)
+        side = position.get("side")
+        stop_loss = monitor.get("stop_loss")
+        take_profit = monitor.get("take_profit")
+
+        # Check PnL-based stop loss ($5 max loss)
+        if pnl <= -5.0:
+            return f"PnL Stop Loss: ${pnl:.2f}"
+        if not current_price:
+            return None
+        if stop_loss:
+            if side == "long" and current_price <= stop_loss:
+                return f"Price Stop Loss: {current_price} <= {stop_loss}"
+            if side == "short" and current_price >= stop_loss:
+                return f"Price Stop Loss: {current_price} >= {stop_loss}"
+        if take_profit:
+            if side == "long" and current_price >= take_profit:
+                return f"Take Profit: {current_price} >= {take_profit}"
+            if side == "short" and current_price <= take_profit:
+                return f"Take Profit: {current_price} <= {take_profit}"
+        return None
+
+    async def _monitor_positions_ws(self, ws_exchange):
+        """Check SL/TP on every pushed ticker instead of polling prices."""
+        # Reuse the REST client's markets instead of loading them again
+        await asyncio.to_thread(self._ensure_markets)
+        ws_exchange.set_markets(self.exchange.markets)
+
+        streams = [asyncio.create_task(self._ticker_stream(ws_exchange))]
+        if ws_exchange.has.get("watchOrders"):
+            streams.append(asyncio.create_task(self._order_stream(ws_exchange)))
+        self.log.info("Position monitoring using websocket streams")
+        try:
+            # If one stream fails the other must not keep running on a
+            # client that is about to be closed
+            done, _ = await asyncio.wait(streams, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in streams:
+                task.cancel()
+            await asyncio.gather(*streams, return_exceptions=True)
+            await ws_exchange.close()
+
+    async def _ticker_stream(self, ws_exchange):
+        """Close monitored positions as soon as a pushed price hits SL/TP."""
+        positions = {}
+        positions_refreshed = 0.0
         while self.monitoring_active:
+            symbols = self._watched_symbols(self._monitored_symbols())
+            if not symbols:
+                await asyncio.sleep(self.check_interval)
+                continue
+
+            # Positions (and their unrealized PnL) change far less often
+            # than prices; refresh them over REST on the usual interval
+            if time.monotonic() - positions_refreshed >= self.check_interval:
+                open_positions = await asyncio.to_thread(
+                    self.get_open_positions, symbols=symbols
+                )
+                positions = {p.get("symbol"): p for p in open_positions}
+                positions_refreshed = time.monotonic()
+
             try:
-                positions = self.get_open_positions()
-                print(f"\n=== Monitoring {len(positions)} positions ===")
-
-                for position in positions:
-                    symbol = position.get("symbol")
-
-                    # Get PnL for stop loss check
-                    pnl = float(position.get("unrealizedPnl") or 0)
-                    side = position.get("side")
-
-                    print(f"\nChecking {symbol}: PnL=${pnl:.2f}, Side={side}")
-
-                    # Check if we have monitoring targets
-                    monitor = None
-                    monitor_key = None
-
-                    # Find matching monitor
-                    for key, data in self.pending_monitors.items():
-                        if key == symbol or key in symbol or symbol in key:
-                            monitor = data
-                            monitor_key = key
-                            break
-
-                    if monitor:
-                        stop_loss = monitor.get("stop_loss")
-                        take_profit = monitor.get("take_profit")
-
-                        print(f"Monitor found: SL={stop_loss}, TP={take_profit}")
-
-                        # Check both PnL-based stop loss AND price-based stop loss
-                        trigger_close = False
-                        close_reason = ""
-
-                        # Check PnL-based stop loss ($5 max loss)
-                        if pnl <= -5.0:
-                            trigger_close = True
-                            close_reason = f"PnL Stop Loss: ${pnl:.2f}"
-
-                        # Check price-based stop loss if specified
-                        elif stop_loss:
-                            try:
-                                ticker = self.exchange.fetch_ticker(symbol)
-                                current_price = float(ticker.get("last", 0))
-
-                                print(
-                                    f"Checking price-based SL: Current price={current_price}, SL={stop_loss}"
-                                )
-
-                                # For long positions: close if price <= stop loss
-                                if side == "long" and current_price <= stop_loss:
-                                    trigger_close = True
-                                    close_reason = f"Price Stop Loss: {current_price} <= {stop_loss}"
-
-                                # For short positions: close if price >= stop loss
-                                elif side == "short" and current_price >= stop_loss:
-                                    trigger_close = True
-                                    close_reason = f"Price Stop Loss: {current_price} >= {stop_loss}"
-
-                            except Exception as e:
-                                print(f"Error checking price-based stop loss: {e}")
-
-                        # Execute close if triggered
-                        if trigger_close:
-                            print(f">>> STOP LOSS TRIGGERED: {close_reason}")
-                            print(f"Attempting to close position {symbol}")
-                            result = self.close_position(symbol)
-                            print(f"Close result: {result}")
-
-                            if result.get("success"):
-                                self.pending_monitors.pop(monitor_key, None)
-                                print(f"Position closed - Stop loss")
-                            else:
-                                print(
-                                    f"Failed to close position: {result.get('message', 'Unknown error')}"
-                                )
-                            continue
+                tickers = await asyncio.wait_for(
+                    ws_exchange.watch_tickers(symbols), self.check_interval
+                )
+            except asyncio.TimeoutError:
+                continue
+
+            for symbol, ticker in tickers.items():
+                position = positions.get(symbol)
+                monitor_key = self.normalize_symbol(symbol)
+                monitor = self.pending_monitors.get(monitor_key)
+                if not position or not monitor:
+                    continue
+                reason = self._close_reason(
+                    position, monitor, float(ticker.get("last") or 0)
+                )
+                if reason is None:
+                    continue
 
-                        # Check take profit
-                        if take_profit:
-                            try:
-                                ticker = self.exchange.fetch_ticker(symbol)
-                                current_price = float(ticker.get("last", 0))
-
-                                print(
-                                    f"Current price from ticker: {current_price}, TP target: {take_profit}"
-                                )
-
-                                # Check take profit conditions
-                                if side == "long" and current_price >= take_profit:
-                                    print(
-                                        f">>> TAKE PROFIT TRIGGERED: Price {current_price} >= {take_profit}"
-                                    )
-                                    print(f"Attempting to close position {symbol}")
-                                    result = self.close_position(symbol)
-                                    print(f"Close result: {result}")
-
-                                    if result.get("success"):
-                                        self.pending_monitors.pop(monitor_key, None)
-                                        print(f"Position closed - Take profit")
-                                    else:
-                                        print(
-                                            f"Failed to close position: {result.get('message', 'Unknown error')}"
-                                        )
-
-                                elif side == "short" and current_price <= take_profit:
-                                    print(
-                                        f">>> TAKE PROFIT TRIGGERED: Price {current_price} <= {take_profit}"
-                                    )
-                                    print(f"Attempting to close position {symbol}")
-                                    result = self.close_position(symbol)
-                                    print(f"Close result: {result}")
-
-                                    if result.get("success"):
-                                        self.pending_monitors.pop(monitor_key, None)
-                                        print(f"Position closed - Take profit")
-                                    else:
-                                        print(
-                                            f"Failed to close position: {result.get('message', 'Unknown error')}"
-                                        )
-
-                            except Exception as e:
-                                print(f"Error fetching ticker price: {e}")
-                                import traceback
-
-                                traceback.print_exc()
-
-                print(f"\n=== Monitoring cycle complete ===")
-                time.sleep(self.check_interval)
+                if await asyncio.to_thread(
+                    self._try_close_and_deregister, symbol, monitor_key, reason
+                ):
+                    positions.pop(symbol, None)
 
-            except Exception as e:
-                print(f"Monitor error: {e}")
-                import traceback
+    async def _order_stream(self, ws_exchange):
+        """Apply pushed fills and cancels to pending orders as they happen."""
+        while self.monitoring_active:
+            try:
+                orders = await asyncio.wait_for(
+                    ws_exchange.watch_orders(), self.check_interval
+                )
+            except asyncio.TimeoutError:
+                continue
+
+            for order in orders:
+                trade = self._orders_by_id.get(order.get("id"))
+                new_status = ORDER_STATUS_MAP.get(order.get("status"))
+                if trade is None or new_status is None:
+                    continue
+                if trade.get("status") == "pending":
+                    await asyncio.to_thread(
+                        self.update_order_status, order["id"], new_status
+                    )
 
-                traceback.print_exc()
-                time.sleep(self.check_interval)
+    async def _monitor_positions_rest(self):
+        """Poll positions and tickers for SL/TP on a fixed interval."""
+        while self.monitoring_active:
+            # A cycle makes blocking REST calls; keep them off the shared loop
+            await asyncio.to_thread(self._monitor_cycle)
+            await asyncio.sleep(self.check_interval)
+
+    def _monitor_cycle(self):
+        """Run one polling pass over the open positions."""
+        try:
+            monitors = self._monitors_snapshot()
+            # Only monitored positions can trigger a close; ask for just those
+            positions = self.get_open_positions(
+                symbols=[m["symbol"] for m in monitors.values()]
+            )
+            self.log.debug("=== Monitoring %d positions ===", len(positions))
+            # One batched price request per cycle for every monitored
+            # position, so the checks below are in-memory comparisons
+            tickers = self._fetch_last_prices(
+                {
+                    position.get("symbol")
+                    for position in positions
+                    if self.normalize_symbol(position.get("symbol")) in monitors
+                }
+            )
+
+            for position in positions:
+                symbol = position.get("symbol")
+
+                # Get PnL for stop loss check
+                pnl = float(position.get("unrealizedPnl") or 0)
+                side = position.get("side")
+
+                self.log.debug("Checking %s: PnL=$%.2f, Side=%s", symbol, pnl, side)
+
+                # Check if we have monitoring targets
+                monitor_key = self.normalize_symbol(symbol)
+                monitor = monitors.get(monitor_key)
+
+                if monitor:
+                    self.log.debug(
+                        "Monitor found: SL=%s, TP=%s",
+                        monitor.get("stop_loss"),
+                        monitor.get("take_profit"),
+                    )
+
+                    # Check both PnL-based stop loss AND price-based SL/TP
+                    reason = self._close_reason(position, monitor, tickers.get(symbol))
+                    if reason is not None:
+                        self._try_close_and_deregister(symbol, monitor_key, reason)
+
+            self.log.debug("=== Monitoring cycle complete ===")
+        except Exception as e:
+            self.log.exception("Monitor error: %s", e)
+
+    def _fetch_last_prices(self, symbols) -> Dict[str, float]:
+        """Last traded price per symbol, in one request where supported."""
+        if not symbols:
+            return {}
+        try:
+            if self._has_fetch_tickers:
+                tickers = self._api("fetch_tickers", list(symbols))
+            else:
+                tickers = {s: self._api("fetch_ticker", s) for s in symbols}
+        except Exception as e:
+            self.log.warning("Error fetching ticker price: %s", e)
+            return {}
+        return {
+            symbol: float(ticker.get("last") or 0) for symbol, ticker in tickers.items()
+        }
+
+    def _try_close_and_deregister(self, symbol: str, monitor_key: str, reason: str):
+        """Close a triggered position and drop its monitor; True if it closed."""
+        self.log.info(">>> CLOSE TRIGGERED: %s", reason)
+        self.log.info("Attempting to close position %s", symbol)
+        result = self.close_position(symbol)
+        self.log.info("Close result: %s", result)
+        if result.get("success"):
+            with self._monitors_lock:
+                self.pending_monitors.pop(monitor_key, None)
+            self.log.info("Position closed - %s", reason)
+            return True
+        self.log.warning(
+            "Failed to close position: %s", result.get("message", "Unknown error")
+        )
+        return False
+
+    def _monitors_snapshot(self) -> Dict[str, Dict]:
+        """Copy of pending_monitors that is safe to iterate without the lock."""
+        with self._monitors_lock:
+            return dict(self.pending_monitors)
+
+    def _monitored_symbols(self) -> List[str]:
+        return [m["symbol"] for m in self._monitors_snapshot().values()]
 
     def normalize_symbol(self, symbol: str) -> str:
         """Normalize symbol format for comparison"""
-        # Remove common variations
-        normalized = (
-            symbol.replace(":USDT", "").replace("/USDT", "").replace("USDT", "")
-        )
-        # Add back /USDT format
-        if "/" not in normalized:
-            normalized = normalized + "/USDT"
-        return normalized
+        return _normalize_symbol(symbol)
 
     def debug_monitors(self):
         """Debug method to see current monitoring status"""
         print("=== MONITORING DEBUG ===")
         print(f"Monitoring active: {self.monitoring_active}")
-        print(f"Pending monitors: {self.pending_monitors}")
+        print(f"Pending monitors: {self._monitors_snapshot()}")
 
         positions = self.get_open_positions()
         for position in positions:
@@ -387,40 +818,90 @@ class CryptoFuturesTrader:
         """Get current monitoring status"""
         return {
             "active": self.monitoring_active,
-            "monitored_positions": list(self.pending_monitors.keys()),
+            "monitored_positions": list(self._monitors_snapshot()),
             "check_interval": self.check_interval,
         }
 
+    @property
+    def exchange(self):
+        """The ccxt exchange client, created on first access."""
+        if self._exchange is None:
+            with self._exchange_lock:
+                if self._exchange is None:
+                    exchange = self._initialize_exchange(*self._credentials)
+                    # ccxt prices each endpoint in units of rateLimit ms (CoinEx
+                    # charges 40 for positions, 20 for orders); its own throttle
+                    # isn't thread-safe, so charge those costs to a shared bucket
+                    rate = 1000 / max(exchange.rateLimit, 1)
+                    self._bucket = TokenBucket(rate=rate, burst=rate)
+                    exchange.enableRateLimit = True
+                    exchange.throttle = self._throttle
+                    # Capabilities are fixed per exchange class; read them once
+                    self._has_set_leverage = bool(exchange.has.get("setLeverage"))
+                    self._has_set_margin_mode = bool(exchange.has.get("setMarginMode"))
+                    self._has_fetch_tickers = bool(exchange.has.get("fetchTickers"))
+                    self._has_fetch_position = bool(exchange.has.get("fetchPosition"))
+                    self._has_fetch_open_orders = bool(
+                        exchange.has.get("fetchOpenOrders")
+                    )
+                    self._has_fetch_closed_orders = bool(
+                        exchange.has.get("fetchClosedOrders")
+                    )
+                    self._exchange = exchange
+        return self._exchange
+
+    def connect(self):
+        """Create the exchange client and load its markets now."""
+        self._ensure_markets()
+
+    def _exchange_config(self, api_key: str, secret_key: str) -> Dict:
+        """ccxt constructor options shared by the REST and websocket clients."""
+        # Special configuration for CoinEx
+        if self._is_coinex:
+            return {
+                "apiKey": api_key,
+                "secret": secret_key,
+                "enableRateLimit": False,
+                "options": {
+                    "defaultType": "swap",  # CoinEx uses 'swap' for futures
+                    "createMarketBuyOrderRequiresPrice": False,
+                },
+            }
+        return {
+            "apiKey": api_key,
+            "secret": secret_key,
+            "enableRateLimit": False,
+            "options": {"defaultType": "future"},
+        }
+
     def _initialize_exchange(self, exchange_id: str, api_key: str, secret_key: str):
         """Initialize connection to the exchange."""
+        import ccxt
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        if exchange_id not in ccxt.exchanges:
+            raise ValueError(f"Unsupported exchange: {exchange_id}")
+
         try:
             exchange_class = getattr(ccxt, exchange_id)
 
-            # Special configuration for CoinEx
-            if exchange_id.lower() == "coinex":
-                exchange = exchange_class(
-                    {
-                        "apiKey": api_key,
-                        "secret": secret_key,
-                        "enableRateLimit": True,
-                        "options": {
-                            "defaultType": "swap",  # CoinEx uses 'swap' for futures
-                            "createMarketBuyOrderRequiresPrice": False,
-                        },
-                    }
-                )
-            else:
-                exchange = exchange_class(
-                    {
-                        "apiKey": api_key,
-                        "secret": secret_key,
-                        "enableRateLimit": True,
-                        "options": {"defaultType": "future"},
-                    }
-                )
-
-            # Load markets
-            exchange.load_markets()
+            exchange = exchange_class(self._exchange_config(api_key, secret_key))
+
+            # Keep enough warm keep-alive connections for concurrent callers
+            # (request pool, monitor thread, web requests, batch closes) so
+            # TLS sessions are reused instead of discarded when the pool
+            # overflows. Retry dropped connections briefly; urllib3 only
+            # retries reads for idempotent methods, so an order POST is never
+            # sent twice.
+            exchange.session.mount(
+                "https://",
+                HTTPAdapter(
+                    pool_connections=HTTP_POOL_HOSTS,
+                    pool_maxsize=HTTP_POOL_SIZE,
+                    max_retries=Retry(total=2, backoff_factor=0.1),
+                ),
+            )
 
             print(f"Successfully connected to {exchange_id}")
             return exchange
@@ -428,109 +909,577 @@ class CryptoFuturesTrader:
             print(f"Error connecting to exchange: {e}")
             raise
 
+    def api_wait(self, cost: float = 1) -> float:
+        """Seconds until the rate limiter would admit a request of `cost` units."""
+        if self._exchange is None:
+            return 0.0
+        return self._bucket.wait_time(cost)
+
+    def _throttle(self, cost=None):
+        """ccxt throttle hook: wait for the endpoint's cost in the shared bucket."""
+        self._bucket.acquire(1 if cost is None else cost)
+
+    def _api(self, method: str, *args):
+        """Call an exchange method; each request it makes is paced by the bucket."""
+        return getattr(self.exchange, method)(*args)
+
+    def _build_market_index(self):
+        """Index loaded markets for O(1) case-insensitive symbol lookups."""
+        self._market_id_upper = {
+            market_id.upper(): market_id for market_id in self.exchange.markets or {}
+        }
+        self._symbol_cache = {}
+        self._market_cache = {}  # symbol -> (exchange symbol, market)
+        self._futures_markets = None  # Built on first request
+
+    def _ensure_markets(self):
+        """Load markets and build the symbol index on first need."""
+        if self._markets_loaded:
+            if time.monotonic() < self._markets_expire:
+                return
+            # Long-running processes still pick up new listings and limits
+            self.reload_markets()
+            return
+
+        with _shared_markets_lock:
+            shared = _shared_markets.get(self.exchange_id)
+        if shared is not None and time.monotonic() < shared[1]:
+            # Another trader on this exchange already parsed the markets
+            attrs, self._markets_expire, self._markets_from_disk = shared
+            for attr, value in attrs.items():
+                setattr(self.exchange, attr, value)
+        else:
+            cached = self._read_markets_cache()
+            if cached:
+                markets, currencies, age = cached
+                self.exchange.set_markets(markets, currencies)
+                self._markets_from_disk = True
+                self._markets_expire = time.monotonic() + MARKETS_CACHE_TTL - age
+            else:
+                self.exchange.load_markets()
+                self._write_markets_cache()
+                self._markets_expire = time.monotonic() + MARKETS_CACHE_TTL
+            self._share_markets()
+        self._build_market_index()
+        self._markets_loaded = True
+
+    def _share_markets(self):
+        """Offer this client's parsed markets to later traders on the exchange."""
+        attrs = {attr: getattr(self.exchange, attr, None) for attr in MARKET_ATTRS}
+        with _shared_markets_lock:
+            _shared_markets[self.exchange_id] = (
+                attrs,
+                self._markets_expire,
+                self._markets_from_disk,
+            )
+
+    def reload_markets(self):
+        """Reload markets from the exchange and rebuild the symbol index."""
+        self.exchange.load_markets(reload=True)
+        self._write_markets_cache()
+        self._build_market_index()
+        self._markets_loaded = True
+        self._markets_expire = time.monotonic() + MARKETS_CACHE_TTL
+        self._markets_from_disk = False
+        self._share_markets()
+
+    def futures_markets(self) -> List[Dict]:
+        """Swap and future markets, listed once per markets load."""
+        self._ensure_markets()
+        if self._futures_markets is None:
+            self._futures_markets = [
+                {
+                    "symbol": symbol,
+                    "base": market.get("base"),
+                    "quote": market.get("quote"),
+                    "type": market.get("type"),
+                }
+                for symbol, market in self.exchange.markets.items()
+                if market.get("type") in FUTURES_MARKET_TYPES
+            ]
+        return self._futures_markets
+
+    def _read_markets_cache(self):
+        """Return (markets, currencies, age in seconds) saved by a previous run if under a day old."""
+        try:
+            with open(self._markets_cache_path, "r") as f:
+                cached = json.load(f)
+            age = time.time() - cached["saved"]
+            if 0 <= age < MARKETS_CACHE_TTL:
+                return cached["markets"], cached.get("currencies"), age
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _write_markets_cache(self):
+        """Save the loaded markets so the next start can skip load_markets."""
+        tmp_path = self._markets_cache_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(
+                    self._encode(
+                        {
+                            "saved": time.time(),
+                            "markets": self.exchange.markets,
+                            "currencies": self.exchange.currencies,
+                        }
+                    )
+                )
+            os.replace(tmp_path, self._markets_cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error caching markets: {e}")
+
+    def _resolve_market(self, symbol: str):
+        """Return (exchange symbol, market), refreshing disk-cached markets once on a miss."""
+        cached = self._market_cache.get(symbol)
+        if cached is not None:
+            return cached
+
+        formatted_symbol = self.format_symbol_for_exchange(symbol)
+        try:
+            market = self.exchange.market(formatted_symbol)
+        except Exception:
+            if not self._markets_from_disk:
+                raise
+            # The cached markets may predate a new listing
+            self.reload_markets()
+            formatted_symbol = self.format_symbol_for_exchange(symbol)
+            market = self.exchange.market(formatted_symbol)
+        self._market_cache[symbol] = (formatted_symbol, market)
+        return formatted_symbol, market
+
     def _load_state(self):
-        """Load trading state from file if it exists."""
+        """Load the counters header and the journaled history from disk."""
+        state = {}
         if os.path.exists(self.config_path):
             try:
                 with open(self.config_path, "r") as f:
                     state = json.load(f)
+                if not isinstance(state, dict):
+                    raise ValueError("state header is not a JSON object")
+            except (OSError, ValueError) as e:
+                # History lives in the journal; only the counters fall back
+                print(f"Error loading state header, using defaults: {e}")
+                state = {}
 
-                # Check if state is from today
-                last_date = datetime.fromisoformat(state.get("date", "2000-01-01"))
-                if last_date.date() == datetime.now().date():
-                    self.daily_trade_count = state.get("daily_trade_count", 0)
-                    self.daily_pnl = state.get("daily_pnl", 0.0)
-                    self.last_trade_time = (
-                        datetime.fromisoformat(state.get("last_trade_time"))
-                        if state.get("last_trade_time")
-                        else None
-                    )
-                    self.trades_history = state.get("trades_history", [])
-                    self.position_history = state.get("position_history", [])
-                    print(
-                        f"Loaded today's state: {self.daily_trade_count} trades, ${self.daily_pnl} PnL"
-                    )
-                else:
-                    print("New trading day, resetting state")
-            except Exception as e:
-                print(f"Error loading state: {e}")
+        try:
+            # Leverage settings stay valid across trading days
+            for symbol, settings in state.get("leverage_settings", {}).items():
+                self._leverage_cache[symbol] = tuple(settings)
+
+            # Counters only carry over within the same day; history is
+            # kept across days and today's part is found by time
+            saved_ts = self._state_timestamp(state.get("date"))
+            is_today = datetime.fromtimestamp(saved_ts).date() == datetime.now().date()
+            if is_today:
+                self.daily_trade_count = state.get("daily_trade_count", 0)
+                self.daily_pnl = state.get("daily_pnl", 0.0)
+            if state.get("last_trade_time"):
+                self.last_trade_time_ts = self._state_timestamp(
+                    state["last_trade_time"]
+                )
+                self.last_trade_time = datetime.fromtimestamp(self.last_trade_time_ts)
+                # Anchor the monotonic clock to the persisted wall time
+                elapsed = time.time() - self.last_trade_time_ts
+                self._last_trade_monotonic = time.monotonic() - elapsed
+
+            if "trades_history" in state or "position_history" in state:
+                # Migrate history out of the old single-file format
+                self.trades_history = state.get("trades_history", [])
+                self.position_history = state.get("position_history", [])
+                self._backfill_trade_ts()
+                self._build_trade_times()
+                self._seed_leverage_cache()
+                self._archive_settled_history()
+                self._rewrite_journal()
+                self._save_state()
+            else:
+                # Replayed whatever the header says: a missing or damaged
+                # header must not drop the journaled trades
+                self._replay_journal()
+                backfilled = self._backfill_trade_ts()
+                self._build_trade_times()
+                self._seed_leverage_cache()
+                archived = self._archive_settled_history()
+                if backfilled or archived or self._journal_stale:
+                    # Start the session from a compact journal
+                    self._rewrite_journal()
+            self._index_trades()
+            if is_today:
+                print(
+                    f"Loaded today's state: {self.daily_trade_count} trades, ${self.daily_pnl} PnL"
+                )
+            elif state or self.trades_history:
+                print("New trading day, resetting state")
+        except Exception as e:
+            print(f"Error loading state: {e}")
+
+    def _seed_leverage_cache(self):
+        """Seed the leverage cache from the last settings used for each symbol.
+
+        Runs before settled trades are archived, while they are still in
+        trades_history.
+        """
+        if self._leverage_cache:
+            return
+        for trade in self.trades_history:
+            if trade.get("leverage") and trade.get("margin_mode"):
+                self._leverage_cache[trade.get("symbol")] = (
+                    trade["leverage"],
+                    trade["margin_mode"],
+                )
 
     def _save_state(self):
-        """Save current trading state to file."""
+        """Queue an atomic save of the trading counters; history lives in the journal."""
         state = {
-            "date": datetime.now().isoformat(),
+            "date": time.time(),
             "daily_trade_count": self.daily_trade_count,
             "daily_pnl": self.daily_pnl,
-            "last_trade_time": (
-                self.last_trade_time.isoformat() if self.last_trade_time else None
-            ),
-            "trades_history": self.trades_history,
-            "position_history": self.position_history,
+            "last_trade_time": self.last_trade_time_ts or None,
+            "leverage_settings": self._leverage_cache,
         }
 
-        with open(self.config_path, "w") as f:
-            json.dump(state, f, indent=4)
+        # Encoded here so the snapshot is consistent; the atomic swap and
+        # fsync happen on the writer thread, off the request path
+        self._writer.replace(self.config_path, self._encode(state))
 
-    def can_trade(self) -> Dict[str, Union[bool, str]]:
-        """Check if trading is allowed based on risk rules."""
-        now = datetime.now()
+    def flush_state(self):
+        """Wait until all saved state and journal entries are on disk."""
+        self._writer.flush()
 
-        # Check if we're in a new day and reset counters if needed
-        if self.last_trade_time and self.last_trade_time.date() < now.date():
+    @staticmethod
+    def _state_timestamp(value) -> float:
+        """POSIX time from a saved state field (older files stored ISO strings)."""
+        if isinstance(value, (int, float)):
+            return float(value)
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except (TypeError, ValueError):
+            return 0.0
+
+    @staticmethod
+    def _encode(obj) -> str:
+        # Compact output keeps json on its C encoder; indent forces the
+        # pure-Python path and roughly doubles the bytes written
+        return json.dumps(obj, separators=(",", ":"))
+
+    def _encode_event(self, event: Dict) -> str:
+        return self._encode(event) + "\n"
+
+    def _journal_event(self, event: Dict):
+        """Append a single event to the journal."""
+        line = self._encode_event(event)
+        with self._journal_lock:
+            if self._journal is None:
+                self._journal = open(self._journal_path, "a", buffering=1)
+            self._journal.write(line)
+        self._writer.submit(self._journal_path)
+
+    def _journal_status(self, order_id, status: str):
+        self._journal_event({"event": "status", "order_id": order_id, "status": status})
+        # Status events only patch earlier trade events; fold them in once
+        # enough pile up so replay time stays proportional to history size
+        self._journal_stale += 1
+        if self._journal_stale >= JOURNAL_COMPACT_EVENTS:
+            self._rewrite_journal()
+
+    def _rewrite_journal(self):
+        """Replace the journal with the current in-memory history."""
+        with self._journal_lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+            self._journal_stale = 0
+
+            tmp_path = self._journal_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                for trade in self.trades_history:
+                    f.write(self._encode_event({"event": "trade", "trade": trade}))
+                for position in self.position_history:
+                    f.write(
+                        self._encode_event({"event": "position", "position": position})
+                    )
+            os.replace(tmp_path, self._journal_path)
+        self._writer.submit(self._journal_path)
+
+    @staticmethod
+    def _position_timestamp(position: Dict) -> float:
+        """POSIX time a position closed, or 0.0 if its time is unreadable."""
+        try:
+            return datetime.fromisoformat(position.get("close_time")).timestamp()
+        except (TypeError, ValueError):
+            return 0.0
+
+    @staticmethod
+    def _trade_timestamp(trade: Dict) -> float:
+        """POSIX time of a trade record, or 0.0 if its time is unreadable."""
+        if "ts" in trade:
+            return float(trade["ts"])
+        try:
+            return datetime.fromisoformat(trade.get("time")).timestamp()
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _backfill_trade_ts(self) -> bool:
+        """Give trades saved before "ts" existed an epoch timestamp, once."""
+        # Times are validated here, once, so later reads compare ts directly
+        missing = [trade for trade in self.trades_history if "ts" not in trade]
+        for trade in missing:
+            trade["ts"] = int(self._trade_timestamp(trade))
+            if not trade["ts"]:
+                print(
+                    f"Trade {trade.get('order_id')} has an unreadable time "
+                    f"{trade.get('time')!r}; treating it as the oldest trade"
+                )
+        return bool(missing)
+
+    def _build_trade_times(self):
+        """Sort loaded trades by time and rebuild the parallel time column."""
+        # Trades are appended in time order; sorting only repairs records
+        # loaded out of order. From here on place_trade appends to the
+        # column and archiving trims it, so it is parsed once per load
+        self.trades_history.sort(key=self._trade_timestamp)
+        self._trade_times = array(
+            "d", (self._trade_timestamp(trade) for trade in self.trades_history)
+        )
+
+    def _index_trades(self):
+        """Rebuild today's start, fill count and order lookups from trades_history."""
+        self._today_start_ts = datetime.combine(
+            self._trading_day, datetime.min.time()
+        ).timestamp()
+        # The column is sorted, so today's trades are a suffix of the history
+        self._today_start_idx = bisect_left(self._trade_times, self._today_start_ts)
+        self._filled_today = sum(
+            1
+            for trade in self.trades_history[self._today_start_idx :]
+            if trade.get("status") == "filled"
+        )
+
+        self._orders_by_id = {}
+        self._pending_limit_trades = {}
+        for trade in self.trades_history:
+            self._index_order(trade)
+        self.history_version += 1
+
+    def _index_order(self, trade: Dict):
+        """Add a trade to the order-id lookups."""
+        order_id = trade.get("order_id")
+        self._orders_by_id[order_id] = trade
+        if trade.get("status") == "pending" and trade.get("order_type") == "limit":
+            self._pending_limit_trades[order_id] = trade
+
+    def _set_order_status(self, trade: Dict, status: str):
+        """Record a status change for a trade and keep the lookups current."""
+        if self._trade_timestamp(trade) >= self._today_start_ts:
+            self._filled_today += (status == "filled") - (
+                trade.get("status") == "filled"
+            )
+        trade["status"] = status
+        self.history_version += 1
+        self._journal_status(trade.get("order_id"), status)
+        if status == "pending" and trade.get("order_type") == "limit":
+            self._pending_limit_trades[trade.get("order_id")] = trade
+        else:
+            self._pending_limit_trades.pop(trade.get("order_id"), None)
+
+    def _archive_settled_history(self) -> bool:
+        """Move settled trades and closed positions from before today into the archive."""
+        today_start = datetime.combine(
+            self._trading_day, datetime.min.time()
+        ).timestamp()
+        with self._journal_lock:
+            keep, keep_times, settled = [], array("d"), []
+            for trade, ts in zip(self.trades_history, self._trade_times):
+                if trade.get("status") != "pending" and ts < today_start:
+                    settled.append(trade)
+                else:
+                    keep.append(trade)
+                    keep_times.append(ts)
+            keep_positions, closed = [], []
+            for position in self.position_history:
+                if self._position_timestamp(position) < today_start:
+                    closed.append(position)
+                else:
+                    keep_positions.append(position)
+            if not settled and not closed:
+                return False
+
+            # Make the archive durable before the journal forgets these records
+            with open(self._archive_path, "ab") as raw:
+                with gzip.open(raw, "at") as f:
+                    for trade in settled:
+                        f.write(self._encode_event({"event": "trade", "trade": trade}))
+                    for position in closed:
+                        f.write(
+                            self._encode_event(
+                                {"event": "position", "position": position}
+                            )
+                        )
+                raw.flush()
+                os.fsync(raw.fileno())
+            self.trades_history = keep
+            self._trade_times = keep_times
+            self.position_history = keep_positions
+        print(f"Archived {len(settled)} settled trades and {len(closed)} positions")
+        return True
+
+    def _roll_day(self, now: datetime):
+        """Start a new trading day, archiving the previous days' settled history."""
+        # Archiving swaps the history lists and rewrites the journal; holding
+        # the lock throughout keeps concurrent appends and status changes
+        # from landing in a list or journal that is about to be replaced
+        with self._journal_lock:
+            if now.date() == self._trading_day:
+                return  # Another thread already rolled over
+            self._trading_day = now.date()
+            if self._archive_settled_history():
+                self._rewrite_journal()
+            self._index_trades()
             self.daily_trade_count = 0
             self.daily_pnl = 0.0
-            self.trades_history = []
-            print("New day detected, reset daily counters")
+        self._save_state()
+        print("New day detected, reset daily counters")
 
-        # Check max trades per day
-        if self.daily_trade_count >= self.max_trades_per_day:
-            return {
-                "allowed": False,
-                "reason": f"Max daily trades ({self.max_trades_per_day}) reached",
-            }
+    def _replay_journal(self):
+        """Rebuild trade and position history from the journal."""
+        if not os.path.exists(self._journal_path):
+            return
 
-        # Check cooldown period
-        if self.last_trade_time and now < self.last_trade_time + timedelta(
-            minutes=self.cooldown_minutes
-        ):
-            cooldown_ends = self.last_trade_time + timedelta(
-                minutes=self.cooldown_minutes
+        trades_by_id = {}
+        with open(self._journal_path, "r") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-write; nothing follows it
+                    print("Skipping unreadable journal entry")
+                    continue
+
+                kind = event.get("event")
+                if kind == "trade":
+                    trade = self._compact_record(event["trade"])
+                    self.trades_history.append(trade)
+                    trades_by_id[trade.get("order_id")] = trade
+                elif kind == "status":
+                    self._journal_stale += 1
+                    trade = trades_by_id.get(event.get("order_id"))
+                    if trade is not None:
+                        trade["status"] = sys.intern(str(event.get("status")))
+                elif kind == "position":
+                    self.position_history.append(
+                        self._compact_record(event["position"])
+                    )
+
+    @staticmethod
+    def _compact_record(record: Dict) -> Dict:
+        """Share key strings and repeated values between records from the journal."""
+        # json.loads allocates fresh strings on every line; interning makes
+        # each loaded record reference a single copy of them instead
+        return {
+            sys.intern(key): (
+                sys.intern(value)
+                if key in INTERNED_FIELDS and isinstance(value, str)
+                else value
             )
-            wait_mins = (cooldown_ends - now).total_seconds() / 60
-            return {
-                "allowed": False,
-                "reason": f"Cooldown period active. Wait {wait_mins:.1f} more minutes",
-            }
+            for key, value in record.items()
+        }
 
-        # Check daily loss limit
+    def _mark_trade(self, now: datetime):
+        """Count a filled trade and start its cooldown."""
+        self.last_trade_time = now
+        self.last_trade_time_ts = now.timestamp()
+        self._last_trade_monotonic = time.monotonic()
+        self.daily_trade_count += 1
+
+    @property
+    def cooldown_minutes(self):
+        return self._cooldown_minutes
+
+    @cooldown_minutes.setter
+    def cooldown_minutes(self, minutes):
+        self._cooldown_minutes = minutes
+        self._cooldown_delta = timedelta(minutes=minutes)
+        self._cooldown_seconds = minutes * 60
+
+    def _can_trade_fast(self, now: datetime) -> int:
+        """Return TRADE_ALLOWED, or the REJECT_* code of the first failing rule."""
+        # Check if we're in a new day and reset counters if needed
+        if now.date() != self._trading_day:
+            self._roll_day(now)
+
+        if self.daily_trade_count >= self.max_trades_per_day:
+            return REJECT_MAX_TRADES
+        if (
+            self._last_trade_monotonic is not None
+            and time.monotonic() - self._last_trade_monotonic < self._cooldown_seconds
+        ):
+            return REJECT_COOLDOWN
         if self.daily_pnl <= -self.max_daily_loss:
-            return {
-                "allowed": False,
-                "reason": f"Daily loss limit (${self.max_daily_loss}) reached",
-            }
+            return REJECT_LOSS_LIMIT
+        return TRADE_ALLOWED
+
+    def _reject_reason(self, code: int) -> str:
+        """Build the human-readable message for a rejection code."""
+        wait_mins = 0.0
+        if code == REJECT_COOLDOWN:
+            elapsed = time.monotonic() - self._last_trade_monotonic
+            wait_mins = (self._cooldown_seconds - elapsed) / 60
+        return REJECT_REASONS[code].format(
+            max_trades=self.max_trades_per_day,
+            wait_mins=wait_mins,
+            max_loss=self.max_daily_loss,
+        )
 
-        return {"allowed": True, "reason": "Trading allowed"}
+    def can_trade(self, now: Optional[datetime] = None) -> TradeDecision:
+        """Check if trading is allowed based on risk rules."""
+        if now is None:
+            now = datetime.now()
+        code = self._can_trade_fast(now)
+        if code == TRADE_ALLOWED:
+            return ALLOWED_DECISION
+        return TradeDecision(False, self._reject_reason(code))
 
     def format_symbol_for_exchange(self, symbol: str) -> str:
         """Format symbol according to exchange requirements."""
+        cached = self._symbol_cache.get(symbol)
+        if cached is not None:
+            return cached
+
+        formatted_symbol = symbol
         # CoinEx uses specific symbol formats for futures/swaps
-        if self.exchange_id == "coinex":
+        if self._is_coinex and "/" in symbol:
+            self._ensure_markets()
             # CoinEx swap markets are typically in the format BTCUSDT or similar without '/'
-            if "/" in symbol:
-                # Convert BTC/USDT to BTCUSDT format
-                formatted_symbol = symbol.replace("/", "")
+            formatted_symbol = symbol.replace("/", "")
+            # Return the exact case as in the exchange if this market exists
+            formatted_symbol = self._market_id_upper.get(
+                formatted_symbol.upper(), formatted_symbol
+            )
 
-                # Check if this market exists
-                markets = self.exchange.markets
-                for market_id in markets:
-                    if market_id.upper() == formatted_symbol.upper():
-                        return market_id  # Return the exact case as in the exchange
+        # For other exchanges or if no special formatting is needed, return as is
+        self._symbol_cache[symbol] = formatted_symbol
+        return formatted_symbol
 
-                # If no exact match, return the transformed format
-                return formatted_symbol
+    def set_leverage(self, symbol: str, leverage: int):
+        """Set leverage for a symbol, forgetting its cached configuration."""
+        self._leverage_cache.pop(self.format_symbol_for_exchange(symbol), None)
+        return self._api("set_leverage", leverage, symbol)
 
-        # For other exchanges or if no special formatting is needed, return as is
-        return symbol
+    def set_margin_mode(self, symbol: str, margin_mode: str):
+        """Set margin mode for a symbol, forgetting its cached configuration."""
+        self._leverage_cache.pop(self.format_symbol_for_exchange(symbol), None)
+        return self._api("set_margin_mode", margin_mode, symbol)
+
+    def fetch_ticker(self, symbol: str) -> Dict:
+        """Fetch the ticker for an exchange symbol through the rate limiter."""
+        return self._api("fetch_ticker", symbol)
+
+    def cancel_order(self, order_id: str):
+        """Cancel an order through the rate limiter, passing its symbol if known."""
+        trade = self._orders_by_id.get(order_id) or {}
+        return self._api("cancel_order", order_id, trade.get("symbol"))
 
     def check_order_types(self, symbol: str):
         """Check available order types for a symbol."""
@@ -544,14 +1493,55 @@ class CryptoFuturesTrader:
             print(f"Market info: {market.get('info', {})}")
 
             # Try to fetch order types using exchange capabilities
-            if hasattr(self.exchange, "has"):
-                print(f"Exchange capabilities: {self.exchange.has}")
+            print(f"Exchange capabilities: {self.exchange.has}")
 
             return True
         except Exception as e:
             print(f"Error checking order types: {e}")
             return False
 
+    @staticmethod
+    def _coinex_order_params(leverage: int, post_only: bool, is_limit: bool) -> Dict:
+        order_params = {"leverage": leverage}
+        if post_only and is_limit:
+            order_params["timeInForce"] = "PO"  # Post Only
+        return order_params
+
+    @staticmethod
+    def _generic_order_params(leverage: int, post_only: bool, is_limit: bool) -> Dict:
+        order_params = {"type": "future"}
+        if post_only and is_limit:
+            order_params["postOnly"] = True
+        return order_params
+
+    def _submit_coinex_settings(
+        self, symbol, leverage, margin_mode, cached_leverage, cached_margin
+    ):
+        """Queue the leverage/margin update; returns (leverage, margin) futures."""
+        # CoinEx applies leverage and margin mode in a single request,
+        # and set_leverage alone would default the mode to cross
+        if (cached_leverage, cached_margin) == (leverage, margin_mode):
+            return None, None
+        leverage_future = self._io_pool.submit(
+            self._api, "set_leverage", leverage, symbol, {"marginMode": margin_mode}
+        )
+        return leverage_future, None
+
+    def _submit_generic_settings(
+        self, symbol, leverage, margin_mode, cached_leverage, cached_margin
+    ):
+        """Queue the leverage/margin updates; returns (leverage, margin) futures."""
+        leverage_future = margin_future = None
+        if cached_leverage != leverage and self._has_set_leverage:
+            leverage_future = self._io_pool.submit(
+                self._api, "set_leverage", leverage, symbol
+            )
+        if cached_margin != margin_mode and self._has_set_margin_mode:
+            margin_future = self._io_pool.submit(
+                self._api, "set_margin_mode", margin_mode, symbol
+            )
+        return leverage_future, margin_future
+
     def place_trade(
         self,
         symbol: str,
@@ -573,10 +1563,12 @@ class CryptoFuturesTrader:
         )
 
         # Check risk parameters
-        trade_check = self.can_trade()
-        if not trade_check["allowed"]:
-            print(f"Trade rejected: {trade_check['reason']}")
-            return {"success": False, "message": trade_check["reason"]}
+        now = datetime.now()
+        code = self._can_trade_fast(now)
+        if code != TRADE_ALLOWED:
+            reason = self._reject_reason(code)
+            print(f"Trade rejected: {reason}")
+            return {"success": False, "message": reason}
 
         # Check position size
         if amount > self.max_position_size:
@@ -587,45 +1579,66 @@ class CryptoFuturesTrader:
 
         try:
             # Make sure markets are loaded
-            if not self.exchange.markets:
-                self.exchange.load_markets()
+            self._ensure_markets()
 
             # Format symbol for the specific exchange
             formatted_symbol = self.format_symbol_for_exchange(symbol)
 
             # Get market info for proper sizing
             try:
-                market = self.exchange.market(formatted_symbol)
+                formatted_symbol, market = self._resolve_market(symbol)
             except Exception as e:
                 return {
                     "success": False,
                     "message": f"Symbol not found or not supported: {formatted_symbol}. Error: {str(e)}",
                 }
 
-            # Set leverage first
-            try:
-                self.exchange.set_leverage(leverage, formatted_symbol)
-                print(f"Set leverage to {leverage}x for {formatted_symbol}")
-            except Exception as e:
-                print(f"Warning: Could not set leverage - {str(e)}")
+            # Only send the settings that differ from what was last applied;
+            # repeat trades skip both round-trips. Leverage, margin mode and
+            # the sizing price are independent, so they are issued
+            # concurrently, and calls the exchange doesn't support are
+            # skipped rather than left to fail
+            cached_leverage, cached_margin = self._leverage_cache.get(
+                formatted_symbol, (None, None)
+            )
+            leverage_future, margin_future = self._submit_settings(
+                formatted_symbol, leverage, margin_mode, cached_leverage, cached_margin
+            )
+            ticker_future = (
+                None
+                if price
+                else self._io_pool.submit(self._api, "fetch_ticker", formatted_symbol)
+            )
 
-            # Set margin mode
-            try:
-                if self.exchange_id == "coinex":
-                    # CoinEx requires leverage parameter with margin mode
-                    self.exchange.set_margin_mode(
-                        margin_mode, formatted_symbol, {"leverage": leverage}
-                    )
-                else:
-                    self.exchange.set_margin_mode(margin_mode, formatted_symbol)
-                print(f"Set margin mode to {margin_mode} for {formatted_symbol}")
-            except Exception as e:
-                print(f"Warning: Could not set margin mode - {str(e)}")
+            applied = [leverage, margin_mode]
+            if leverage_future is not None:
+                try:
+                    leverage_future.result()
+                    print(f"Set leverage to {leverage}x for {formatted_symbol}")
+                except Exception as e:
+                    applied[0] = cached_leverage
+                    if self._is_coinex:
+                        applied[1] = cached_margin
+                    print(f"Warning: Could not set leverage - {str(e)}")
+
+            if margin_future is not None:
+                try:
+                    margin_future.result()
+                    print(f"Set margin mode to {margin_mode} for {formatted_symbol}")
+                except Exception as e:
+                    applied[1] = cached_margin
+                    print(f"Warning: Could not set margin mode - {str(e)}")
+
+            if leverage_future is None and margin_future is None:
+                print(
+                    f"Leverage {leverage}x and {margin_mode} margin already set for {formatted_symbol}"
+                )
+            self._leverage_cache[formatted_symbol] = tuple(applied)
 
             # Calculate quantity based on current price if not specified
-            if not price:
+            if ticker_future is not None:
                 try:
-                    ticker = self.exchange.fetch_ticker(formatted_symbol)
+                    ticker = ticker_future.result()
                     price_for_calculation = ticker["last"]
                     print(f"Got market price for calculation: {price_for_calculation}")
                 except Exception as e:
@@ -657,32 +1670,34 @@ class CryptoFuturesTrader:
             is_maker = order_type == "limit"
 
             # Exchange-specific order parameters
-            if self.exchange_id == "coinex":
-                # For CoinEx swap
-                order_params = {
-                    "leverage": leverage,
-                }
-
-                # Add post-only parameter if requested
-                if post_only and order_type == "limit":
-                    order_params["timeInForce"] = "PO"  # Post Only
-            else:
-                order_params = {"type": "future"}
-                if post_only and order_type == "limit":
-                    order_params["postOnly"] = True
-
-            print(
-                f"Placing {order_type} order: {side} {quantity} {formatted_symbol} @ {price if price else 'market'}"
-            )
+            order_params = self._order_params(leverage, post_only, is_maker)
 
             # Place the actual order
             if order_type == "limit":
-                order = self.exchange.create_order(
-                    formatted_symbol, "limit", side, quantity, price, order_params
+                print(
+                    f"Placing limit order: {side} {quantity} {formatted_symbol} @ {price}"
+                )
+                order = self._api(
+                    "create_order",
+                    formatted_symbol,
+                    "limit",
+                    side,
+                    quantity,
+                    price,
+                    order_params,
                 )
             else:
-                order = self.exchange.create_order(
-                    formatted_symbol, "market", side, quantity, None, order_params
+                print(
+                    f"Placing market order: {side} {quantity} {formatted_symbol} @ market"
+                )
+                order = self._api(
+                    "create_order",
+                    formatted_symbol,
+                    "market",
+                    side,
+                    quantity,
+                    None,
+                    order_params,
                 )
 
             print(f"Order placed: {order}")
@@ -695,7 +1710,8 @@ class CryptoFuturesTrader:
 
             # Record trade
             trade_record = {
-                "time": datetime.now().isoformat(),
+                "time": now.isoformat(),
+                "ts": int(now.timestamp()),
                 "symbol": formatted_symbol,
                 "side": side,
                 "amount": amount,
@@ -713,8 +1729,7 @@ class CryptoFuturesTrader:
 
             # Increment trade count for market orders
             if is_market_order:
-                self.last_trade_time = datetime.now()
-                self.daily_trade_count += 1
+                self._mark_trade(now)
                 print(f"Market order counted as trade #{self.daily_trade_count}")
 
             # Add SL/TP to monitoring
@@ -722,18 +1737,31 @@ class CryptoFuturesTrader:
                 # Use the actual symbol format returned by the exchange
                 actual_symbol = order.get("symbol", formatted_symbol)
 
-                self.pending_monitors[actual_symbol] = {
+                monitor = {
+                    "symbol": actual_symbol,
                     "side": side,
                     "stop_loss": stop_loss,
                     "take_profit": take_profit,
                     "entry_price": price if price else price_for_calculation,
                     "quantity": quantity,
                 }
+                with self._monitors_lock:
+                    self.pending_monitors[self.normalize_symbol(actual_symbol)] = (
+                        monitor
+                    )
 
                 print(f"Added monitor for symbol: {actual_symbol}")
 
-            # Add to trade history
-            self.trades_history.append(trade_record)
+            # Add to trade history; holding the journal lock keeps a
+            # compaction from writing the trade before its own event does
+            with self._journal_lock:
+                self.trades_history.append(trade_record)
+                self.history_version += 1
+                self._trade_times.append(now.timestamp())
+                self._index_order(trade_record)
+                if is_market_order:
+                    self._filled_today += 1
+                self._journal_event({"event": "trade", "trade": trade_record})
 
             # Save state
             self._save_state()
@@ -748,26 +1776,17 @@ class CryptoFuturesTrader:
             error_msg = str(e)
             print(f"Error placing trade: {error_msg}")
             # Check for common exchange-specific errors
-            if "balance" in error_msg.lower():
-                return {
-                    "success": False,
-                    "message": f"Insufficient balance. Error: {error_msg}",
-                }
-            elif "permission" in error_msg.lower():
-                return {
-                    "success": False,
-                    "message": f"API permission issue. Make sure your API key has trading permissions. Error: {error_msg}",
-                }
-            elif "symbol" in error_msg.lower():
-                return {
-                    "success": False,
-                    "message": f"Symbol error. The pair {symbol} may not be available for futures trading. Error: {error_msg}",
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": f"Error placing trade: {self.exchange_id} {error_msg}",
-                }
+            low = error_msg.lower()
+            for needle, template in _ERR_MAP:
+                if needle in low:
+                    return {
+                        "success": False,
+                        "message": template.format(error=error_msg, symbol=symbol),
+                    }
+            return {
+                "success": False,
+                "message": f"Error placing trade: {self.exchange_id} {error_msg}",
+            }
 
     def update_pnl(self, trade_pnl: float):
         """
@@ -778,46 +1797,48 @@ class CryptoFuturesTrader:
         """
         self.daily_pnl += trade_pnl
         print(f"Updated daily PnL: ${self.daily_pnl:.2f}")
+        self._check_loss_limit()
+        self._save_state()
+
+    def update_pnl_batch(self, pnls: Iterable[float]):
+        """
+        Add several closed-trade PnLs at once, saving state a single time.
 
-        # Check if we've hit daily loss limit
+        Args:
+            pnls: Profit/loss amounts in USD
+        """
+        self.daily_pnl += math.fsum(pnls)
+        print(f"Updated daily PnL: ${self.daily_pnl:.2f}")
+        self._check_loss_limit()
+        self._save_state()
+
+    def _check_loss_limit(self):
+        """Warn when the daily loss limit has been reached."""
         if self.daily_pnl <= -self.max_daily_loss:
             print(
                 f"WARNING: Daily loss limit of ${self.max_daily_loss} has been reached. Trading stopped for today."
             )
 
-        self._save_state()
-
     def get_trading_status(self) -> Dict:
         """Get current trading status and risk metrics."""
-        can_trade_result = self.can_trade()
-
-        # If self.daily_trade_count is incorrect, recount from trade history
-        filled_trades_today = []
-        today = datetime.now().date()
+        # One clock read serves the risk check and the reported date
+        now = datetime.now()
+        can_trade_result = self.can_trade(now)
 
-        for trade in self.trades_history:
-            if trade.get("status") == "filled":
-                try:
-                    trade_time = datetime.fromisoformat(trade.get("time"))
-                    if trade_time.date() == today:
-                        filled_trades_today.append(trade)
-                except:
-                    # Skip trades with invalid time format
-                    pass
-
-        # Reset daily trade count if it doesn't match filled trades
-        if len(filled_trades_today) != self.daily_trade_count:
+        # Reset daily trade count if it doesn't match today's filled trades,
+        # which are counted as they are recorded rather than rescanned here
+        if self._filled_today != self.daily_trade_count:
             print(
-                f"WARNING: Trade count mismatch. Resetting from {self.daily_trade_count} to {len(filled_trades_today)}"
+                f"WARNING: Trade count mismatch. Resetting from {self.daily_trade_count} to {self._filled_today}"
             )
-            self.daily_trade_count = len(filled_trades_today)
+            self.daily_trade_count = self._filled_today
             self._save_state()
 
         return {
             "exchange": self.exchange_id,
-            "date": datetime.now().isoformat(),
-            "can_trade": can_trade_result["allowed"],
-            "status_message": can_trade_result["reason"],
+            "date": now.isoformat(),
+            "can_trade": can_trade_result.allowed,
+            "status_message": can_trade_result.reason,
             "daily_trade_count": self.daily_trade_count,
             "max_trades_per_day": self.max_trades_per_day,
             "trades_remaining": max(
@@ -830,109 +1851,152 @@ class CryptoFuturesTrader:
                 self.last_trade_time.isoformat() if self.last_trade_time else None
             ),
             "cooldown_ends": (
-                (
-                    self.last_trade_time + timedelta(minutes=self.cooldown_minutes)
-                ).isoformat()
+                (self.last_trade_time + self._cooldown_delta).isoformat()
                 if self.last_trade_time
                 else None
             ),
-            "trades_history": self.trades_history,
-            "position_history": self.position_history,
+            "trades_history": self.trades_history[-STATUS_TRADES_LIMIT:],
+            "trades_history_total": len(self.trades_history),
+            "position_history": self.position_history[-STATUS_TRADES_LIMIT:],
+            "position_history_total": len(self.position_history),
         }
 
-    def get_open_positions(self) -> List[Dict]:
-        """Get all open futures positions."""
+    def _watched_symbols(self, symbols: Iterable[str]) -> List[str]:
+        """Unified exchange symbols for the given symbols, skipping unknown ones."""
+        watch = set()
+        for symbol in symbols:
+            for candidate in (symbol, self.format_symbol_for_exchange(symbol)):
+                try:
+                    watch.add(self.exchange.market(candidate)["symbol"])
+                    break
+                except Exception:
+                    pass  # Unknown or delisted symbol
+        return sorted(watch)
+
+    def _iter_open_positions(self, symbols=None):
+        """Yield open positions, for all symbols or only the given ones.
+
+        Given symbols of which none resolve to a market yield nothing
+        rather than widening the request to every position.
+        """
+        self._ensure_markets()
+        watch = self._watched_symbols(symbols) if symbols is not None else None
+        if watch is None:
+            positions = self._api("fetch_positions")
+        elif not watch:
+            positions = []
+        elif self._is_coinex and len(watch) > 1:
+            # CoinEx accepts at most one symbol filter per request
+            positions = [
+                p for symbol in watch for p in self._api("fetch_positions", [symbol])
+            ]
+        else:
+            positions = self._api("fetch_positions", watch)
+        return (p for p in positions if float(p.get("contracts", 0)) > 0)
+
+    def get_pending_orders(self) -> List[Dict]:
+        """Limit orders placed but not yet filled or canceled."""
+        return list(self._pending_limit_trades.values())
+
+    def get_open_positions(
+        self, raise_errors: bool = False, symbols: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """Get open futures positions, for all symbols unless some are given.
+
+        A failed fetch returns [] unless raise_errors is set, for callers
+        that must tell "no positions" apart from "couldn't ask".
+        """
         try:
-            if self.exchange_id == "coinex":
-                # CoinEx might require specific method or endpoint
-                positions = self.exchange.fetch_positions()
-                return [p for p in positions if float(p.get("contracts", 0)) > 0]
-            else:
-                positions = self.exchange.fetch_positions()
-                return [p for p in positions if float(p.get("contracts", 0)) > 0]
+            return list(self._iter_open_positions(symbols))
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error fetching positions: {e}")
             return []
 
     def close_position(
-        self, symbol: str, order_type: str = "market", limit_price: float = None
+        self,
+        symbol: str,
+        order_type: str = "market",
+        limit_price: float = None,
+        positions: List[Dict] = None,
     ) -> Dict:
-        """Close an open position for a symbol."""
-        try:
-            positions = self.get_open_positions()
+        """Close an open position for a symbol.
 
-            # Find the position with matching symbol (handle format variations)
-            position = None
-            actual_symbol = None
-
-            for p in positions:
-                pos_symbol = p.get("symbol")
-                if pos_symbol == symbol or symbol in pos_symbol or pos_symbol in symbol:
-                    position = p
-                    actual_symbol = pos_symbol
-                    break
+        positions, if given, is a recent get_open_positions() result to find
+        the position in instead of asking the exchange again.
+        """
+        _start_log_listener()
+        try:
+            # Resolve to the exchange's unified symbol so a single position
+            # can be asked for directly where the exchange supports it
+            unified = (
+                None
+                if positions is not None
+                else self._watched_symbols(
+                    [symbol, self.format_symbol_for_exchange(symbol)]
+                )
+            )
+            if unified and len(unified) == 1 and self._has_fetch_position:
+                position = self._api("fetch_position", unified[0])
+                if not position or not float(position.get("contracts") or 0):
+                    position = None
+            else:
+                if positions is None:
+                    # A symbol form the markets don't know (e.g. "BTC") is
+                    # matched against every open position instead
+                    positions = self._iter_open_positions(unified or None)
+
+                # Match on the canonical BASE/USDT form so format variations
+                # (BTC, BTCUSDT, BTC/USDT:USDT) agree without substring tests
+                # that would let "ETH" match "METH/USDT"
+                by_symbol = {
+                    self.normalize_symbol(p.get("symbol")): p for p in positions
+                }
+                position = by_symbol.get(self.normalize_symbol(symbol))
 
             if not position:
                 return {
                     "success": False,
                     "message": f"No open position found for {symbol}",
                 }
+            actual_symbol = position["symbol"]
 
-            print(f"Closing position with actual symbol: {actual_symbol}")
-            print(f"Order type: {order_type}, Limit price: {limit_price}")
+            CLOSE_LOG.info("Closing position with actual symbol: %s", actual_symbol)
+            CLOSE_LOG.info("Order type: %s, Limit price: %s", order_type, limit_price)
 
             # Determine close direction (opposite of position)
-            side = "sell" if position["side"] == "long" else "buy"
+            side = CLOSE_SIDE[position["side"]]
             amount = abs(float(position["contracts"]))
 
-            # Place closing order with exchange-specific parameters
-            if self.exchange_id == "coinex":
-                if order_type == "limit" and limit_price:
-                    order = self.exchange.create_order(
-                        actual_symbol,
-                        "limit",
-                        side,
-                        amount,
-                        limit_price,
-                        {"reduceOnly": True},
-                    )
-                else:
-                    # Default to market order
-                    order = self.exchange.create_order(
-                        actual_symbol,
-                        "market",
-                        side,
-                        amount,
-                        None,
-                        {"reduceOnly": True},
-                    )
+            # The PnL reference price doesn't depend on the closing order, so
+            # fetch it while the order is in flight
+            ticker_future = self._io_pool.submit(
+                self._api, "fetch_ticker", actual_symbol
+            )
+
+            # Place closing order with exchange-specific parameters; a limit
+            # close without a price falls back to a market order
+            if order_type == "limit" and limit_price:
+                close_type, close_price = "limit", limit_price
             else:
-                if order_type == "limit" and limit_price:
-                    order = self.exchange.create_order(
-                        actual_symbol,
-                        "limit",
-                        side,
-                        amount,
-                        limit_price,
-                        {"reduceOnly": True, "type": "future"},
-                    )
-                else:
-                    order = self.exchange.create_order(
-                        actual_symbol,
-                        "market",
-                        side,
-                        amount,
-                        None,
-                        {"reduceOnly": True, "type": "future"},
-                    )
+                close_type, close_price = "market", None
+            order = self._api(
+                "create_order",
+                actual_symbol,
+                close_type,
+                side,
+                amount,
+                close_price,
+                dict(self._close_params),
+            )
 
-            # Try to get current price if needed for PNL calculation
+            # Current price for PNL calculation
             price_for_calc = None
             try:
-                ticker = self.exchange.fetch_ticker(actual_symbol)
-                price_for_calc = ticker["last"]
+                price_for_calc = ticker_future.result()["last"]
             except Exception as e:
-                print(f"Warning: Could not fetch price for calculation: {e}")
+                CLOSE_LOG.warning("Could not fetch price for calculation: %s", e)
 
             # Calculate and record position history
             try:
@@ -945,7 +2009,8 @@ class CryptoFuturesTrader:
                     else float(position.get("notional", 0))
                 )
                 entry_price = float(position.get("entryPrice", 0))
-                exit_price = float(order_details.get("price", price_for_calc or 0))
+                # Market orders usually come back with price=None
+                exit_price = float(order_details.get("price") or price_for_calc or 0)
 
                 # Calculate realized PNL
                 if position_side == "long":
@@ -977,7 +2042,7 @@ class CryptoFuturesTrader:
                 entry_fee_rate = maker_fee_rate if entry_is_maker else taker_fee_rate
 
                 # Exit fee based on current order type
-                exit_is_maker = order_type == "limit"
+                exit_is_maker = close_type == "limit"
                 exit_fee_rate = maker_fee_rate if exit_is_maker else taker_fee_rate
 
                 # Calculate total fees
@@ -985,8 +2050,13 @@ class CryptoFuturesTrader:
                 exit_fee = position_size * exit_fee_rate
                 total_fees = entry_fee + exit_fee
 
-                print(
-                    f"Fees calculation: Entry={entry_is_maker}({entry_fee_rate}), Exit={exit_is_maker}({exit_fee_rate}), Total=${total_fees:.6f}"
+                CLOSE_LOG.info(
+                    "Fees calculation: Entry=%s(%s), Exit=%s(%s), Total=$%.6f",
+                    entry_is_maker,
+                    entry_fee_rate,
+                    exit_is_maker,
+                    exit_fee_rate,
+                    total_fees,
                 )
 
                 # Record the closed position
@@ -1000,14 +2070,7 @@ class CryptoFuturesTrader:
                     fees=round(total_fees, 6),  # Increased precision for fees
                 )
             except Exception as e:
-                print(f"Error recording position history: {e}")
-
-            # Then the return statement
-            return {
-                "success": True,
-                "order": order,
-                "message": f"Successfully closed position for {actual_symbol} with {order_type} order",
-            }
+                CLOSE_LOG.error("Error recording position history: %s", e)
 
             return {
                 "success": True,
@@ -1048,29 +2111,7 @@ class CryptoFuturesTrader:
         }
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Crypto Futures Trader with Risk Management"
-    )
-    parser.add_argument(
-        "--exchange",
-        type=str,
-        required=True,
-        help="Exchange ID (e.g., coinex, binance)",
-    )
-    parser.add_argument(
-        "--config", type=str, default="trader_config.json", help="Path to config file"
-    )
-    parser.add_argument("--apikey", type=str, required=True, help="API Key")
-    parser.add_argument("--secret", type=str, required=True, help="Secret Key")
-
-    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
-
-    # Status command
-    status_parser = subparsers.add_parser("status", help="Get trading status")
-
-    # Trade command
-    trade_parser = subparsers.add_parser("trade", help="Place a trade")
+def _add_trade_args(trade_parser):
     trade_parser.add_argument(
         "--symbol", type=str, required=True, help="Trading pair (e.g., BTC/USDT)"
     )
@@ -1107,23 +2148,50 @@ def main():
         help="Make order post-only (limit orders only)",
     )
 
-    # Close position command
-    close_parser = subparsers.add_parser("close", help="Close an open position")
+
+def _add_close_args(close_parser):
     close_parser.add_argument(
         "--symbol", type=str, required=True, help="Trading pair to close"
     )
 
-    # Update PnL command
-    pnl_parser = subparsers.add_parser("pnl", help="Update daily PnL")
+
+def _add_pnl_args(pnl_parser):
     pnl_parser.add_argument(
         "--amount", type=float, required=True, help="Profit/loss amount in USD"
     )
 
-    # Positions command
-    positions_parser = subparsers.add_parser("positions", help="Get open positions")
 
-    # Update risk parameters command
-    risk_parser = subparsers.add_parser("risk", help="Update risk parameters")
+def _add_pnl_batch_args(pnl_batch_parser):
+    pnl_batch_parser.add_argument(
+        "--file",
+        type=str,
+        required=True,
+        help="CSV of profit/loss amounts in USD (a 'pnl' column, or the first column)",
+    )
+
+
+def _read_pnl_file(path: str) -> List[float]:
+    """Read PnL amounts from a CSV file, skipping a header row if present."""
+    with open(path, newline="") as f:
+        rows = [row for row in csv.reader(f) if row]
+    if not rows:
+        return []
+    header = [cell.strip().lower() for cell in rows[0]]
+    if "pnl" in header:
+        column = header.index("pnl")
+        rows = rows[1:]
+    else:
+        column = 0
+    pnls = []
+    for row in rows:
+        try:
+            pnls.append(float(row[column]))
+        except (ValueError, IndexError):
+            print(f"Skipping unreadable PnL row: {row}")
+    return pnls
+
+
+def _add_risk_args(risk_parser):
     risk_parser.add_argument("--max-trades", type=int, help="Maximum trades per day")
     risk_parser.add_argument("--cooldown", type=int, help="Cooldown period in minutes")
     risk_parser.add_argument("--max-loss", type=float, help="Maximum daily loss in USD")
@@ -1131,15 +2199,103 @@ def main():
         "--max-size", type=float, help="Maximum position size in USD"
     )
 
-    args = parser.parse_args()
 
-    # Initialize trader
+# CLI commands: name -> (help text, function adding its arguments)
+COMMANDS = {
+    "status": ("Get trading status", None),
+    "trade": ("Place a trade", _add_trade_args),
+    "close": ("Close an open position", _add_close_args),
+    "pnl": ("Update daily PnL", _add_pnl_args),
+    "pnl-batch": ("Update daily PnL from a CSV file", _add_pnl_batch_args),
+    "positions": ("Get open positions", None),
+    "history": ("Print the trade history as one JSON record per line", None),
+    "risk": ("Update risk parameters", _add_risk_args),
+}
+
+
+def _find_command(argv: List[str], value_options: List[str]) -> Optional[str]:
+    """The command word in argv: the first argument that isn't a global option.
+
+    value_options take a value as the next argument (unless given as
+    --option=value), so a value that happens to be a command name, as in
+    --apikey status, is skipped. Unambiguous prefixes count, as argparse
+    accepts them too.
+    """
+    args = iter(argv)
+    for arg in args:
+        if arg == "--":
+            arg = next(args, None)
+            return arg if arg in COMMANDS else None
+        if not arg.startswith("-"):
+            return arg if arg in COMMANDS else None
+        if "=" not in arg and arg.startswith("--") and len(arg) > 2:
+            matches = [option for option in value_options if option.startswith(arg)]
+            if arg in value_options or len(matches) == 1:
+                next(args, None)
+    return None
+
+
+def _build_parser(argv: List[str]) -> argparse.ArgumentParser:
+    """Build the CLI parser, with arguments only for the command being run."""
+    parser = argparse.ArgumentParser(
+        description="Crypto Futures Trader with Risk Management"
+    )
+    global_options = [
+        parser.add_argument(
+            "--exchange",
+            type=str,
+            required=True,
+            help="Exchange ID (e.g., coinex, binance)",
+        ),
+        parser.add_argument(
+            "--config",
+            type=str,
+            default="trader_config.json",
+            help="Path to config file",
+        ),
+        parser.add_argument("--apikey", type=str, required=True, help="API Key"),
+        parser.add_argument("--secret", type=str, required=True, help="Secret Key"),
+    ]
+
+    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+
+    # Without a recognizable command (e.g. --help) build them all
+    wanted = _find_command(
+        argv, [opt for action in global_options for opt in action.option_strings]
+    )
+    for name, (help_text, add_args) in COMMANDS.items():
+        if wanted is None or name == wanted:
+            command_parser = subparsers.add_parser(name, help=help_text)
+            if add_args is not None:
+                add_args(command_parser)
+    return parser
+
+
+def _print_json(obj):
+    """Write a command's result to stdout as JSON."""
+    if sys.stdout.isatty():
+        text = json.dumps(obj, indent=2)
+    else:
+        # Piped output is read by programs; compact JSON stays on the C
+        # encoder, which indent would force onto the pure-Python path
+        text = json.dumps(obj, separators=(",", ":"))
+    sys.stdout.write(text + "\n")
+
+
+def main(argv: Optional[List[str]] = None):
+    if argv is None:
+        argv = sys.argv[1:]
+    parser = _build_parser(argv)
+    args = parser.parse_args(argv)
+
+    # Initialize trader; status/pnl/pnl-batch/risk only touch local state and never
+    # create the exchange client
     trader = CryptoFuturesTrader(args.exchange, args.apikey, args.secret, args.config)
 
     # Execute command
     if args.command == "status":
         status = trader.get_trading_status()
-        print(json.dumps(status, indent=2))
+        _print_json(status)
 
     elif args.command == "trade":
         result = trader.place_trade(
@@ -1153,26 +2309,37 @@ def main():
             args.margin_mode,
             args.post_only,
         )
-        print(json.dumps(result, indent=2))
+        _print_json(result)
 
     elif args.command == "close":
         result = trader.close_position(args.symbol)
-        print(json.dumps(result, indent=2))
+        _print_json(result)
 
     elif args.command == "pnl":
         trader.update_pnl(args.amount)
         status = trader.get_trading_status()
-        print(json.dumps(status, indent=2))
+        _print_json(status)
+
+    elif args.command == "pnl-batch":
+        trader.update_pnl_batch(_read_pnl_file(args.file))
+        status = trader.get_trading_status()
+        _print_json(status)
 
     elif args.command == "positions":
         positions = trader.get_open_positions()
-        print(json.dumps(positions, indent=2))
+        _print_json(positions)
+
+    elif args.command == "history":
+        # One record per line, so long histories never build a single document
+        sys.stdout.writelines(
+            trader._encode_event(trade) for trade in trader.trades_history
+        )
 
     elif args.command == "risk":
         trader.update_risk_parameters(
             args.max_trades, args.cooldown, args.max_loss, args.max_size
         )
-        print(json.dumps(trader.get_risk_parameters(), indent=2))
+        _print_json(trader.get_risk_parameters())
 
     else:
         parser.print_help()
@@ -0,0 +1,174 @@
+import os
+import sys
+
+import ccxt
+import pytest
+
+# The first request would otherwise create instance/.secret_key
+os.environ.setdefault("FLASK_SECRET", "test")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import coinex_trader  # noqa: E402
+from coinex_trader import CryptoFuturesTrader  # noqa: E402
+
+
+def swap_market(base: str) -> dict:
+    """A linear USDT-settled perpetual as ccxt describes it."""
+    return {
+        "id": base + "USDT",
+        "symbol": base + "/USDT:USDT",
+        "base": base,
+        "quote": "USDT",
+        "settle": "USDT",
+        "baseId": base,
+        "quoteId": "USDT",
+        "settleId": "USDT",
+        "type": "swap",
+        "spot": False,
+        "swap": True,
+        "future": False,
+        "option": False,
+        "contract": True,
+        "linear": True,
+        "active": True,
+        "precision": {"amount": 0.0001, "price": 0.01},
+        "limits": {"amount": {"min": 0.001, "max": None}},
+        "info": {},
+    }
+
+
+class StubExchange:
+    """Offline stand-in for a ccxt client: canned markets, recorded calls."""
+
+    bases = ["BTC", "ETH", "SOL"]
+    last_price = 100.0
+
+    def __init__(self, config=None):
+        super().__init__(config or {})
+        self.calls = []
+        self.open_positions = []
+        self.order_statuses = {}  # order id -> status fetch_order reports
+        self._order_id = 0
+
+    def add_position(self, symbol: str, side: str = "long", contracts: float = 0.1):
+        self.open_positions.append(
+            {
+                "symbol": symbol,
+                "side": side,
+                "contracts": contracts,
+                "entryPrice": self.last_price,
+                "unrealizedPnl": 0.0,
+                "notional": contracts * self.last_price,
+            }
+        )
+
+    def load_markets(self, reload=False, params={}):
+        self.set_markets([swap_market(base) for base in self.bases])
+        return self.markets
+
+    def fetch_ticker(self, symbol, params={}):
+        self.calls.append(("fetch_ticker", symbol))
+        return {"symbol": symbol, "last": self.last_price}
+
+    def fetch_tickers(self, symbols=None, params={}):
+        self.calls.append(("fetch_tickers", tuple(symbols or ())))
+        return {s: {"symbol": s, "last": self.last_price} for s in symbols or ()}
+
+    def set_leverage(self, leverage, symbol=None, params={}):
+        self.calls.append(("set_leverage", symbol, leverage))
+        return {}
+
+    def set_margin_mode(self, margin_mode, symbol=None, params={}):
+        self.calls.append(("set_margin_mode", symbol, margin_mode))
+        return {}
+
+    def create_order(self, symbol, type, side, amount, price=None, params={}):
+        self.calls.append(("create_order", symbol, type, side, amount, price))
+        self._order_id += 1
+        symbol = self.market(symbol)["symbol"]
+        if params.get("reduceOnly"):
+            self.open_positions = [
+                p for p in self.open_positions if p["symbol"] != symbol
+            ]
+        return {
+            "id": str(self._order_id),
+            "symbol": symbol,
+            "status": "open" if type == "limit" else "closed",
+            "price": price,
+            "amount": amount,
+            "filled": amount,
+            "average": price or self.last_price,
+        }
+
+    def fetch_order(self, id, symbol=None, params={}):
+        self.calls.append(("fetch_order", id, symbol))
+        return {"id": id, "symbol": symbol, "status": self.order_statuses[id]}
+
+    def cancel_order(self, id, symbol=None, params={}):
+        self.calls.append(("cancel_order", id, symbol))
+        return {"id": id}
+
+    def fetch_positions(self, symbols=None, params={}):
+        self.calls.append(("fetch_positions", tuple(symbols) if symbols else None))
+        if symbols:
+            return [p for p in self.open_positions if p["symbol"] in symbols]
+        return list(self.open_positions)
+
+    def fetch_position(self, symbol, params={}):
+        self.calls.append(("fetch_position", symbol))
+        for position in self.open_positions:
+            if position["symbol"] == symbol:
+                return position
+        return {"symbol": symbol, "contracts": 0}
+
+
+class StubCoinex(StubExchange, ccxt.coinex):
+    pass
+
+
+class StubBinance(StubExchange, ccxt.binance):
+    pass
+
+
+@pytest.fixture
+def make_trader(tmp_path, monkeypatch):
+    """Build a trader whose exchange client is the given stub class."""
+    coinex_trader._shared_markets.clear()
+
+    def make(stub_class=StubCoinex, exchange_id="coinex", config="state.json"):
+        monkeypatch.setattr(
+            CryptoFuturesTrader,
+            "_initialize_exchange",
+            lambda self, exchange_id, api_key, secret_key: stub_class(
+                self._exchange_config(api_key, secret_key)
+            ),
+        )
+        trader = CryptoFuturesTrader(
+            exchange_id, "key", "secret", str(tmp_path / config)
+        )
+        trader.connect()
+        return trader
+
+    yield make
+    coinex_trader._shared_markets.clear()
+
+
+@pytest.fixture
+def client():
+    import web_interface
+
+    web_interface._exchange_cache.clear()
+    yield web_interface.app.test_client()
+    web_interface._exchange_cache.clear()
+
+
+@pytest.fixture
+def use_trader(monkeypatch):
+    """Make a trader the web app's connected trader for one test."""
+    import web_interface
+
+    def use(trader):
+        monkeypatch.setattr(web_interface, "trader", trader)
+        return trader
+
+    return use
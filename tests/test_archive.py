@@ -0,0 +1,74 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from coinex_trader import CryptoFuturesTrader
+
+
+def test_leverage_cache_seeded_from_archived_old_format_history(tmp_path):
+    yesterday = datetime.now() - timedelta(days=1)
+    config_path = tmp_path / "state.json"
+    config_path.write_text(
+        json.dumps(
+            {
+                "date": yesterday.isoformat(),
+                "trades_history": [
+                    {
+                        "time": yesterday.isoformat(),
+                        "symbol": "BTC/USDT:USDT",
+                        "order_id": "1",
+                        "status": "filled",
+                        "leverage": 3,
+                        "margin_mode": "cross",
+                    }
+                ],
+            }
+        )
+    )
+
+    trader = CryptoFuturesTrader("coinex", "key", "secret", str(config_path))
+
+    assert not trader.trades_history
+    assert trader._leverage_cache == {"BTC/USDT:USDT": (3, "cross")}
+
+
+def test_roll_day_archives_settled_trades_and_closed_positions(make_trader):
+    trader = make_trader()
+    trader.cooldown_minutes = 0
+    assert trader.place_trade("BTC/USDT", "buy", 1)["success"]
+    assert trader.place_trade("ETH/USDT", "buy", 1, price=90.0)["success"]
+    trader.record_closed_position("BTC/USDT:USDT", "long", 1, 100, 101, 0.01, 0)
+    pending_id = trader.trades_history[-1]["order_id"]
+
+    # Backdate everything to yesterday, then cross midnight
+    yesterday = datetime.now() - timedelta(days=1)
+    for i in range(len(trader._trade_times)):
+        trader._trade_times[i] = yesterday.timestamp()
+    trader.position_history[0]["close_time"] = yesterday.isoformat()
+    trader._trading_day = yesterday.date()
+    trader._roll_day(datetime.now())
+
+    assert [t["order_id"] for t in trader.trades_history] == [pending_id]
+    assert trader.position_history == []
+    with gzip.open(trader._archive_path, "rt") as f:
+        archived = [json.loads(line)["event"] for line in f]
+    assert archived == ["trade", "position"]
+
+    trader.flush_state()
+    reloaded = CryptoFuturesTrader("coinex", "key", "secret", trader.config_path)
+    assert [t["order_id"] for t in reloaded.trades_history] == [pending_id]
+    assert reloaded.position_history == []
+
+
+def test_roll_day_runs_once_per_day(make_trader):
+    trader = make_trader()
+    trader._trading_day -= timedelta(days=1)
+    trader.daily_pnl = -5.0
+    now = datetime.now()
+
+    trader._roll_day(now)
+    trader.daily_pnl = -1.0
+    trader._roll_day(now)
+
+    assert trader._trading_day == now.date()
+    assert trader.daily_pnl == -1.0
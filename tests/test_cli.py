@@ -0,0 +1,43 @@
+import pytest
+
+from coinex_trader import _build_parser
+
+GLOBALS = ["--exchange", "coinex", "--apikey", "key", "--secret", "secret"]
+
+
+def parse(argv):
+    return _build_parser(argv).parse_args(argv)
+
+
+def test_option_value_named_like_a_command_is_not_the_command():
+    args = parse(
+        ["--exchange", "coinex", "--apikey", "status", "--secret", "s"] + ["positions"]
+    )
+    assert args.command == "positions"
+    assert args.apikey == "status"
+
+
+def test_command_after_equals_form_and_abbreviated_options():
+    argv = ["--exchange=coinex", "--api", "trade", "--sec", "close"]
+    args = parse(
+        argv + ["trade", "--symbol", "BTC/USDT", "--side", "buy", "--amount", "10"]
+    )
+    assert args.command == "trade"
+    assert (args.apikey, args.secret, args.amount) == ("trade", "close", 10.0)
+
+
+def test_only_the_chosen_command_gets_a_parser():
+    parser = _build_parser(GLOBALS + ["close", "--symbol", "BTC/USDT"])
+    assert (
+        parser.parse_args(GLOBALS + ["close", "--symbol", "BTC/USDT"]).symbol
+        == "BTC/USDT"
+    )
+    with pytest.raises(SystemExit):
+        parser.parse_args(GLOBALS + ["status"])
+
+
+@pytest.mark.parametrize("argv", [[], ["--help"], GLOBALS, GLOBALS + ["bogus"]])
+def test_without_a_known_command_every_command_is_built(argv):
+    parser = _build_parser(argv)
+    for command in ("status", "positions", "history"):
+        assert parser.parse_args(GLOBALS + [command]).command == command
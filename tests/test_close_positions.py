@@ -0,0 +1,121 @@
+import pytest
+
+import web_interface
+from conftest import StubBinance
+
+
+def test_batch_close_finds_positions_missing_from_history(
+    client, use_trader, make_trader
+):
+    trader = use_trader(make_trader())
+    trader.exchange.add_position("ETH/USDT:USDT")
+
+    response = client.post(
+        "/close_positions", json={"symbols": ["ETH/USDT", "SOL/USDT"]}
+    )
+
+    results = response.get_json()["responses"]
+    assert [r["success"] for r in results] == [True, False]
+    assert not trader.exchange.open_positions
+
+
+def test_batch_close_trusts_the_shared_positions_fetch(client, use_trader, make_trader):
+    trader = use_trader(make_trader())
+    trader.exchange.add_position("BTC/USDT:USDT")
+
+    response = client.post(
+        "/close_positions",
+        json={"symbols": ["BTC/USDT", "ETH/USDT", "SOL/USDT"]},
+    )
+
+    assert [r["success"] for r in response.get_json()["responses"]] == [
+        True,
+        False,
+        False,
+    ]
+    lookups = [
+        c
+        for c in trader.exchange.calls
+        if c[0] in ("fetch_positions", "fetch_position")
+    ]
+    assert lookups == [("fetch_positions", None)]
+
+
+def test_batch_close_looks_up_each_symbol_when_the_fetch_fails(
+    client, use_trader, make_trader, monkeypatch
+):
+    trader = use_trader(make_trader())
+    trader.exchange.add_position("BTC/USDT:USDT")
+
+    def unavailable(**kwargs):
+        raise RuntimeError("exchange unavailable")
+
+    monkeypatch.setattr(trader, "get_open_positions", unavailable)
+
+    response = client.post("/close_positions", json={"symbols": ["BTC/USDT"]})
+
+    assert response.get_json()["responses"][0]["success"]
+    assert ("fetch_position", "BTC/USDT:USDT") in trader.exchange.calls
+
+
+def test_batch_close_with_nothing_open_makes_one_call(client, use_trader, make_trader):
+    trader = use_trader(make_trader())
+
+    response = client.post(
+        "/close_positions", json={"symbols": ["BTC/USDT", "ETH/USDT"]}
+    )
+
+    assert [r["success"] for r in response.get_json()["responses"]] == [False, False]
+    assert trader.exchange.calls == [("fetch_positions", None)]
+
+
+class ManyMarketsBinance(StubBinance):
+    bases = ["BTC", "ETH", "SOL"] + [f"ALT{i:02d}" for i in range(17)]
+
+
+def test_batch_close_of_many_symbols_is_not_refused(client, use_trader, make_trader):
+    trader = use_trader(make_trader(ManyMarketsBinance, "binance"))
+    symbols = [base + "/USDT" for base in ManyMarketsBinance.bases]
+    for symbol in symbols:
+        trader.exchange.add_position(symbol + ":USDT")
+
+    response = client.post("/close_positions", json={"symbols": symbols})
+
+    assert response.status_code == 200
+    results = response.get_json()["responses"]
+    assert [r["symbol"] for r in results] == symbols
+    assert all(r["success"] for r in results)
+    assert not trader.exchange.open_positions
+
+
+def test_close_refused_with_retry_after_when_limiter_is_backlogged(
+    client, use_trader, make_trader, monkeypatch
+):
+    trader = use_trader(make_trader())
+    trader.exchange.add_position("BTC/USDT:USDT")
+    monkeypatch.setattr(
+        trader, "api_wait", lambda cost=1: web_interface.CLOSE_MAX_WAIT + 1
+    )
+
+    response = client.post("/close_positions", json={"symbols": ["BTC/USDT"]})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(int(web_interface.CLOSE_MAX_WAIT))
+    assert trader.exchange.open_positions
+
+
+@pytest.mark.parametrize(
+    "symbol, valid",
+    [
+        ("BTC", True),
+        ("BTCUSDT", True),
+        ("BTC-USDT", True),
+        ("BTC/USDT:USDT", True),
+        ("BTC/USDT:USDT-250328", True),
+        ("BTC/USDT:USDT-2503", False),
+        ("BAD SYM", False),
+        ("../etc", False),
+    ],
+)
+def test_valid_symbol(symbol, valid):
+    assert web_interface.valid_symbol(symbol) is valid
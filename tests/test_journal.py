@@ -0,0 +1,87 @@
+import json
+import os
+import threading
+
+import pytest
+
+import coinex_trader
+from coinex_trader import CryptoFuturesTrader
+
+
+def reload(trader):
+    trader.flush_state()
+    return CryptoFuturesTrader("coinex", "key", "secret", trader.config_path)
+
+
+@pytest.fixture
+def traded(make_trader):
+    """A trader with one market order and one pending limit order journaled."""
+    trader = make_trader()
+    trader.cooldown_minutes = 0
+    assert trader.place_trade("BTC/USDT", "buy", 1)["success"]
+    assert trader.place_trade("ETH/USDT", "sell", 1, price=110.0)["success"]
+    return trader
+
+
+def test_journal_replay_restores_trades_and_status_changes(traded):
+    limit_id = traded.trades_history[-1]["order_id"]
+    traded.update_order_status(limit_id, "canceled")
+
+    reloaded = reload(traded)
+
+    assert [t["order_id"] for t in reloaded.trades_history] == [
+        t["order_id"] for t in traded.trades_history
+    ]
+    assert reloaded.trades_history[-1]["status"] == "canceled"
+    assert not reloaded.get_pending_orders()
+
+
+@pytest.mark.parametrize("header", [None, "", "{not json", "[]"])
+def test_journal_replayed_when_header_missing_or_damaged(traded, header):
+    traded.flush_state()
+    if header is None:
+        os.remove(traded.config_path)
+    else:
+        with open(traded.config_path, "w") as f:
+            f.write(header)
+
+    reloaded = CryptoFuturesTrader("coinex", "key", "secret", traded.config_path)
+
+    assert len(reloaded.trades_history) == 2
+    assert reloaded.daily_trade_count == 0
+
+
+def test_compaction_folds_status_events_into_trades(traded, monkeypatch):
+    monkeypatch.setattr(coinex_trader, "JOURNAL_COMPACT_EVENTS", 2)
+    limit_id = traded.trades_history[-1]["order_id"]
+    traded.update_order_status(limit_id, "filled")
+    traded.update_order_status(limit_id, "canceled")
+    traded.flush_state()
+
+    with open(traded._journal_path) as f:
+        events = [json.loads(line)["event"] for line in f]
+    assert events == ["trade", "trade"]
+    assert reload(traded).trades_history[-1]["status"] == "canceled"
+
+
+def test_compaction_during_trades_keeps_each_trade_once(make_trader):
+    trader = make_trader()
+    trader.cooldown_minutes = 0
+    stop = threading.Event()
+
+    def compact():
+        while not stop.is_set():
+            trader._rewrite_journal()
+
+    compactor = threading.Thread(target=compact)
+    compactor.start()
+    try:
+        for _ in range(10):
+            assert trader.place_trade("BTC/USDT", "buy", 1)["success"]
+    finally:
+        stop.set()
+        compactor.join()
+
+    order_ids = [t["order_id"] for t in reload(trader).trades_history]
+    assert len(order_ids) == 10
+    assert len(set(order_ids)) == 10
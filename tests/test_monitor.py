@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+
+class FakeWsExchange:
+    has = {"watchOrders": True}
+
+    def __init__(self, events):
+        self.events = events
+
+    def set_markets(self, markets):
+        self.markets = markets
+
+    async def close(self):
+        self.events.append("closed")
+
+
+def test_failed_stream_cancels_the_other_and_closes_the_client(make_trader):
+    trader = make_trader()
+    events = []
+    ws_exchange = FakeWsExchange(events)
+
+    async def ticker_stream(ws_exchange):
+        await asyncio.sleep(0.01)
+        raise ConnectionError("socket dropped")
+
+    async def order_stream(ws_exchange):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            events.append("order stream cancelled")
+            raise
+
+    trader._ticker_stream = ticker_stream
+    trader._order_stream = order_stream
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(
+            asyncio.wait_for(trader._monitor_positions_ws(ws_exchange), timeout=5)
+        )
+
+    # The order stream is stopped before the client it reads from is closed
+    assert events == ["order stream cancelled", "closed"]
@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def limit_order(make_trader):
+    """A trader holding one pending limit order, and that order's id."""
+    trader = make_trader()
+    assert trader.place_trade("BTC/USDT", "buy", 1, price=90.0)["success"]
+    return trader, trader.trades_history[-1]["order_id"]
+
+
+def test_poll_marks_a_filled_limit_order_once(limit_order):
+    trader, order_id = limit_order
+    trader.exchange.order_statuses[order_id] = "closed"
+
+    result = trader.check_limit_order_status()
+
+    assert result["updated"] == [{"order_id": order_id, "status": "filled"}]
+    assert trader.trades_history[-1]["status"] == "filled"
+    assert trader.daily_trade_count == 1
+    assert trader.check_limit_order_status(order_id)["message"] == (
+        "No pending orders to check"
+    )
+
+
+def test_poll_skips_an_order_the_stream_settled_meanwhile(limit_order, monkeypatch):
+    trader, order_id = limit_order
+    fetch_order = trader.exchange.fetch_order
+
+    def stream_wins(id, symbol=None, params={}):
+        # The order stream reports the fill while the poll is in flight
+        trader.update_order_status(id, "filled")
+        return fetch_order(id, symbol, params)
+
+    trader.exchange.order_statuses[order_id] = "closed"
+    monkeypatch.setattr(trader.exchange, "fetch_order", stream_wins)
+
+    result = trader.check_limit_order_status()
+
+    assert result["message"] == "No orders needed updating"
+    assert trader.daily_trade_count == 1
+    assert trader._filled_today == 1
+
+
+def test_concurrent_fill_reports_count_the_trade_once(limit_order):
+    trader, order_id = limit_order
+    start = threading.Barrier(8)
+
+    def report():
+        start.wait()
+        trader.update_order_status(order_id, "filled")
+
+    threads = [threading.Thread(target=report) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert trader.daily_trade_count == 1
+    assert trader._filled_today == 1
+    assert not trader.get_pending_orders()
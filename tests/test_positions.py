@@ -0,0 +1,73 @@
+def test_open_positions_include_symbols_never_traded(make_trader):
+    trader = make_trader()
+    trader.exchange.add_position("ETH/USDT:USDT")
+    assert not trader.trades_history
+
+    positions = trader.get_open_positions()
+
+    assert [p["symbol"] for p in positions] == ["ETH/USDT:USDT"]
+    assert trader.exchange.calls == [("fetch_positions", None)]
+
+
+def test_coinex_fetches_explicit_symbols_one_at_a_time(make_trader):
+    trader = make_trader()
+    trader.exchange.add_position("BTC/USDT:USDT")
+    trader.exchange.add_position("SOL/USDT:USDT")
+
+    positions = trader.get_open_positions(symbols=["BTC/USDT", "SOL/USDT"])
+
+    assert sorted(p["symbol"] for p in positions) == [
+        "BTC/USDT:USDT",
+        "SOL/USDT:USDT",
+    ]
+    assert trader.exchange.calls == [
+        ("fetch_positions", ("BTC/USDT:USDT",)),
+        ("fetch_positions", ("SOL/USDT:USDT",)),
+    ]
+
+
+def test_unknown_explicit_symbols_fetch_nothing(make_trader):
+    trader = make_trader()
+    trader.exchange.add_position("BTC/USDT:USDT")
+
+    assert trader.get_open_positions(symbols=["NOPE/USDT"]) == []
+    assert trader.get_open_positions(symbols=[]) == []
+    assert trader.exchange.calls == []
+
+
+def test_monitor_cycle_asks_only_for_monitored_symbols(make_trader):
+    trader = make_trader()
+    trader.exchange.add_position("BTC/USDT:USDT")
+    trader.exchange.add_position("ETH/USDT:USDT")
+    trader.pending_monitors["BTC/USDT"] = {
+        "symbol": "BTCUSDT",
+        "side": "long",
+        "stop_loss": None,
+        "take_profit": 1000.0,
+        "entry_price": 100.0,
+        "quantity": 0.1,
+    }
+
+    trader._monitor_cycle()
+
+    fetches = [c for c in trader.exchange.calls if c[0] == "fetch_positions"]
+    assert fetches == [("fetch_positions", ("BTC/USDT:USDT",))]
+
+
+def test_monitor_cycle_without_monitors_skips_the_exchange(make_trader):
+    trader = make_trader()
+    trader.exchange.add_position("BTC/USDT:USDT")
+
+    trader._monitor_cycle()
+
+    assert trader.exchange.calls == []
+
+
+def test_close_position_not_in_trade_history(make_trader):
+    trader = make_trader()
+    trader.exchange.add_position("ETH/USDT:USDT", side="short")
+
+    result = trader.close_position("ETH/USDT")
+
+    assert result["success"], result["message"]
+    assert not trader.exchange.open_positions
@@ -0,0 +1,41 @@
+import ccxt
+import pytest
+
+from coinex_trader import TokenBucket
+
+
+def test_token_bucket_admits_burst_then_paces_by_cost():
+    bucket = TokenBucket(rate=10, burst=10)
+    assert bucket.wait_time(10) == 0
+    bucket.acquire(10)
+    assert bucket.wait_time(5) == pytest.approx(0.5, abs=0.05)
+
+
+def test_exchange_requests_charge_ccxt_endpoint_costs(make_trader, monkeypatch):
+    trader = make_trader()
+    charged = []
+    monkeypatch.setattr(trader._bucket, "acquire", charged.append)
+
+    def offline(*args, **kwargs):
+        raise ccxt.NetworkError("offline")
+
+    monkeypatch.setattr(trader.exchange, "fetch", offline)
+    for endpoint in (
+        "v2PrivateGetFuturesPendingPosition",
+        "v2PrivatePostFuturesOrder",
+        "v2PublicGetFuturesTicker",
+    ):
+        with pytest.raises(ccxt.NetworkError):
+            getattr(trader.exchange, endpoint)({})
+    assert charged == [40, 20, 1]
+
+
+def test_cancel_order_passes_recorded_symbol(client, use_trader, make_trader):
+    trader = use_trader(make_trader())
+    trader.place_trade("BTC/USDT", "buy", 1, price=90.0)
+    order_id = trader.trades_history[-1]["order_id"]
+
+    client.post("/cancel_order", data={"order_id": order_id})
+
+    assert ("cancel_order", order_id, "BTCUSDT") in trader.exchange.calls
+    assert trader.trades_history[-1]["status"] == "canceled"
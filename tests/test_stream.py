@@ -0,0 +1,13 @@
+import web_interface
+
+
+def test_event_stream_closes_after_max_age(monkeypatch):
+    monkeypatch.setattr(web_interface, "SSE_MAX_AGE", 0.05)
+    payloads = iter([b"1", b"1", b"2"])
+
+    with web_interface.app.test_request_context():
+        response = web_interface.event_stream(lambda: next(payloads, b"2"), 0.01)
+        body = b"".join(response.response)
+
+    assert body.startswith(b"retry: 1000\n\n")
+    assert b"data: 1\n\n" in body and b"data: 2\n\n" in body
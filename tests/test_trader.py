@@ -0,0 +1,51 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import coinex_trader
+from conftest import StubBinance
+
+
+def test_futures_market_order_sized_from_ticker_despite_cost_orders(make_trader):
+    trader = make_trader(StubBinance, "binance")
+    assert trader.exchange.has["createMarketOrderWithCost"]
+
+    result = trader.place_trade("BTC/USDT", "buy", 5)
+
+    assert result["success"], result["message"]
+    orders = [c[2:] for c in trader.exchange.calls if c[0] == "create_order"]
+    assert orders == [("market", "buy", 0.05, None)]
+    assert trader.trades_history[-1]["price"] == 100.0
+
+
+def test_today_starts_at_first_trade_after_midnight(make_trader):
+    trader = make_trader()
+    trader.cooldown_minutes = 0
+    for _ in range(3):
+        assert trader.place_trade("BTC/USDT", "buy", 1)["success"]
+    # Backdate the first two trades to yesterday
+    yesterday = time.time() - 24 * 60 * 60
+    trader._trade_times[0] = trader._trade_times[1] = yesterday
+
+    trader._index_trades()
+    assert trader._today_start_idx == 2
+    assert trader._filled_today == 1
+
+    trader._trading_day -= timedelta(days=1)
+    trader._roll_day(datetime.now())
+    assert len(trader.trades_history) == len(trader._trade_times) == 1
+    assert trader._today_start_idx == 0
+    assert trader._filled_today == 1
+
+
+def test_status_caps_position_history(make_trader, monkeypatch):
+    monkeypatch.setattr(coinex_trader, "STATUS_TRADES_LIMIT", 2)
+    trader = make_trader()
+    for pnl in range(5):
+        trader.record_closed_position("BTC/USDT:USDT", "long", 1, 100, 101, pnl, 0)
+
+    status = trader.get_trading_status()
+
+    assert [p["realized_pnl"] for p in status["position_history"]] == [3, 4]
+    assert status["position_history_total"] == 5
@@ -0,0 +1,34 @@
+import web_interface
+
+
+def test_cached_reads_are_keyed_by_trader(make_trader):
+    first = make_trader(config="first.json")
+    second = make_trader(config="second.json")
+    second.exchange.add_position("ETH/USDT:USDT")
+    web_interface._exchange_cache.clear()
+
+    assert web_interface.cached_positions(second)
+    assert web_interface.cached_positions(first) == []
+    assert web_interface.BATCH_METHODS["positions"](first) == []
+    web_interface._exchange_cache.clear()
+
+
+def test_secret_key_is_generated_once_and_reused(tmp_path):
+    path = str(tmp_path / "instance" / ".secret_key")
+
+    key = web_interface.load_secret_key(path)
+
+    assert len(key) == 32
+    assert web_interface.load_secret_key(path) == key
+
+
+def test_secret_key_is_resolved_on_first_request(tmp_path, monkeypatch):
+    monkeypatch.delenv("FLASK_SECRET", raising=False)
+    monkeypatch.setattr(web_interface.app, "instance_path", str(tmp_path))
+    monkeypatch.setattr(web_interface.app, "secret_key", None)
+
+    response = web_interface.app.test_client().get("/setup")
+
+    assert response.status_code == 200
+    with open(tmp_path / ".secret_key", "rb") as f:
+        assert web_interface.app.secret_key == f.read()
@@ -1,22 +1,129 @@
 import flask
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import (
+    Flask,
+    Response,
+    render_template,
+    request,
+    redirect,
+    stream_with_context,
+    url_for,
+    flash,
+    jsonify,
+)
+import gzip
 import json
+import logging
 import os
+import re
+import secrets
 import sys
+import threading
+import time
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 import argparse
+from flask.json.provider import DefaultJSONProvider
+from flask.sessions import SecureCookieSessionInterface
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.exceptions import HTTPException
+
+try:
+    import orjson
+except ImportError:  # Optional: the stdlib encoder is used without it
+    orjson = None
 
 # Import our enhanced trader class
 from coinex_trader import CryptoFuturesTrader
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON in and out through orjson, falling back to Flask's encoder for odd types"""
+
+    def loads(self, s, **kwargs):
+        # request.get_json() parses bodies through here
+        return orjson.loads(s)
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj, default=self.default, option=orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS),
+            mimetype=self.mimetype,
+        )
+
+
 app = Flask(__name__)
-app.secret_key = os.urandom(24)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+log = logging.getLogger(__name__)
+
+
+def load_secret_key(path):
+    """Session key shared by every worker and restart, generated on first use"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(path, "rb") as f:
+            key = f.read()
+        if key:
+            return key
+        # Another process is still writing it; fall through with our own
+    except OSError as e:
+        log.warning("Could not create secret key file %s: %s", path, e)
+    else:
+        key = secrets.token_bytes(32)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        return key
+    return secrets.token_bytes(32)
+
+
+_secret_key_lock = threading.Lock()
+
+
+def ensure_secret_key(app):
+    """Set app.secret_key from FLASK_SECRET or the instance key file, once."""
+    with _secret_key_lock:
+        if not app.secret_key:
+            app.secret_key = os.environ.get("FLASK_SECRET") or load_secret_key(
+                os.path.join(app.instance_path, ".secret_key")
+            )
+    return app.secret_key
+
+
+class LazyKeySessionInterface(SecureCookieSessionInterface):
+    """Cookie sessions whose signing key is resolved by the first request.
+
+    Importing the app (tests, tooling, the WSGI loader) then never touches
+    the environment or the instance folder.
+    """
+
+    def get_signing_serializer(self, app):
+        if not app.secret_key:
+            ensure_secret_key(app)
+        return super().get_signing_serializer(app)
+
+
+app.session_interface = LazyKeySessionInterface()
 app.config["WTF_CSRF_ENABLED"] = False  # Disable CSRF for simplicity in this example
+# jsonify: skip sorting keys and emit compact output so every API response
+# takes the C encoder's fast path
+app.json.sort_keys = False
+app.json.compact = True
+# Keep compiled templates across restarts (in a per-user temp directory)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
 
 
 # Add custom filter for formatting timestamps to 12-hour clock
 @app.template_filter("datetimeformat")
+@lru_cache(maxsize=4096)  # Rendered rows repeat the same few timestamps
 def datetimeformat(value):
     """Convert a 24-hour time string to 12-hour format with AM/PM."""
     try:
@@ -31,7 +138,7 @@ def datetimeformat(value):
             hour = 12
 
         return f"{hour}:{minute}:{second} {period}"
-    except:
+    except (AttributeError, ValueError):
         return value
 
 
@@ -79,58 +186,280 @@ class PnLForm(SimpleForm):
         return ""
 
 
-# Global trader instance
-trader = None
+# The forms only carry template placeholders, so one instance of each is
+# shared by every render
+TRADE_FORM = TradeForm()
+CLOSE_FORM = ClosePositionForm()
+PNL_FORM = PnLForm()
 
-# Counter for auto-checking orders
-request_counter = 0
 
+def debug_details():
+    """Traceback of the exception being handled, shown only in debug mode."""
+    return traceback.format_exc() if app.debug else None
 
-@app.before_request
-def before_request():
-    """Run before each request to perform maintenance tasks"""
-    global request_counter
 
-    # Only check orders periodically to avoid rate limits
-    if trader is not None and request.endpoint != "static":
-        request_counter += 1
+def optional_float(form, name):
+    """Float value of an optional form field, or None if missing or blank."""
+    value = form.get(name, "").strip()
+    return float(value) if value else None
+
+
+# Global trader instance. setup() publishes a fully connected trader with a
+# single assignment; handlers read it once into a local so a reconnect
+# mid-request can't split their work across two traders.
+trader = None
+
+# Seconds between background checks of pending limit orders
+ORDER_CHECK_INTERVAL = 30.0
+_order_poller = None
+_background_lock = threading.Lock()
+
+# Short-lived copies of exchange reads, shared by every polling client
+TICKER_TTL = 1.0  # seconds
+POSITIONS_TTL = 2.0  # seconds
+STATUS_TTL = 0.5  # seconds
+# Entries are keyed by the trader they were read from, so a request still
+# holding the previous trader after a reconnect never sees the new one's data
+_exchange_cache = {}  # (trader, key) -> (monotonic expiry, value)
+_exchange_cache_lock = threading.Lock()
+_inflight = {}  # key -> Future of the fetch already talking to the exchange
+# Seconds browsers may reuse API responses without asking again
+MARKETS_MAX_AGE = 300
+STATUS_MAX_AGE = 2
+_markets_payload = (None, b"")  # (markets list, its encoded /api/markets body)
+_history_payload = (None, b"")  # ((trader, history version), encoded body)
+# Positions are re-read in the background so requests never wait on the exchange
+REFRESH_INTERVAL = 2.0  # seconds
+_refresher = None
+_refresh_now = threading.Event()
+# Threads for overlapping independent reads within one request
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="web-io")
+# JSON bodies at least this big are gzipped for clients that accept it
+GZIP_MIN_SIZE = 1024  # bytes
+GZIP_LEVEL = 4
+SSE_HEARTBEAT = 15.0  # seconds between keep-alive comments on idle streams
+# Streams end after this long so each one frees its worker thread; the
+# browser's EventSource reconnects on its own after SSE_RETRY milliseconds
+SSE_MAX_AGE = 300.0  # seconds
+SSE_RETRY = 1000
+
+
+def cached_fetch(key, ttl, fetch, refresh=False):
+    """Return fetch()'s result, reusing it for ttl seconds across requests.
+
+    Concurrent misses on the same key wait for the first caller's fetch
+    instead of each hitting the exchange. refresh=True fetches even if a
+    cached value is still fresh.
+    """
+    with _exchange_cache_lock:
+        entry = _exchange_cache.get(key)
+        if not refresh and entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()
 
-        # Check order status every 10 requests
-        if request_counter % 10 == 0:
+    try:
+        value = fetch()
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(value)
+    finally:
+        with _exchange_cache_lock:
+            # A clear_exchange_cache() mid-fetch drops the entry: don't cache it
+            if _inflight.get(key) is future:
+                del _inflight[key]
+                if future.exception() is None:
+                    _exchange_cache[key] = (time.monotonic() + ttl, value)
+    return value
+
+
+def clear_exchange_cache():
+    """Drop cached exchange reads after anything that changes them."""
+    with _exchange_cache_lock:
+        _exchange_cache.clear()
+        _inflight.clear()
+    _refresh_now.set()
+
+
+def cached_positions(current):
+    return cached_fetch(
+        (current, "positions"), POSITIONS_TTL, current.get_open_positions
+    )
+
+
+def cached_status(current):
+    return cached_fetch((current, "status"), STATUS_TTL, current.get_trading_status)
+
+
+def encode_json(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def json_response(payload: bytes):
+    """Response for an already-encoded JSON body."""
+    return Response(payload, mimetype="application/json")
+
+
+def conditional(response, max_age):
+    """Tag a response with an ETag and max-age; unchanged bodies become a 304."""
+    response.add_etag()
+    response.cache_control.max_age = max_age
+    return response.make_conditional(request)
+
+
+@lru_cache(maxsize=32)
+def gzip_body(body: bytes) -> bytes:
+    """Gzip a response body; the cached API bodies are compressed only once"""
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+@app.after_request
+def compress_response(response):
+    """Gzip sizeable JSON responses for clients that accept it"""
+    if (
+        response.mimetype != "application/json"
+        or response.status_code != 200
+        or response.is_streamed
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    body = response.get_data()
+    if len(body) < GZIP_MIN_SIZE or "gzip" not in request.accept_encodings:
+        return response
+    response.set_data(gzip_body(body))
+    response.headers["Content-Encoding"] = "gzip"
+    # The ETag describes the uncompressed body, so it can only be weak now
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def event_stream(read, interval):
+    """Server-Sent Events response pushing read()'s encoded payload when it changes.
+
+    read() is polled every interval seconds against the shared caches; a
+    comment line every SSE_HEARTBEAT seconds keeps idle proxies from
+    closing the connection. The stream closes after SSE_MAX_AGE seconds
+    and the client reconnects, so no stream holds a thread indefinitely.
+    """
+
+    def generate():
+        last = None
+        quiet = 0.0
+        deadline = time.monotonic() + SSE_MAX_AGE
+        yield b"retry: %d\n\n" % SSE_RETRY
+        while time.monotonic() < deadline:
             try:
-                trader.check_limit_order_status()
+                payload = read()
             except Exception as e:
-                print(f"Error in auto-checking orders: {e}")
+                log.warning("Error in event stream: %s", e)
+                payload = encode_json({"error": str(e)})
+            if payload != last:
+                yield b"data: " + payload + b"\n\n"
+                last = payload
+                quiet = 0.0
+            elif quiet >= SSE_HEARTBEAT:
+                yield b": ping\n\n"
+                quiet = 0.0
+            time.sleep(interval)
+            quiet += interval
+
+    response = Response(stream_with_context(generate()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+def poll_orders():
+    """Check pending limit orders on a fixed cadence, off the request path"""
+    while True:
+        time.sleep(ORDER_CHECK_INTERVAL)
+        current = trader  # setup may swap the trader between checks
+        if current is None:
+            continue
+        try:
+            current.check_limit_order_status()
+        except Exception as e:
+            log.warning("Error in auto-checking orders: %s", e)
+
+
+def refresh_positions():
+    """Keep the cached positions warm so requests read them without waiting"""
+    while True:
+        _refresh_now.wait(REFRESH_INTERVAL)
+        _refresh_now.clear()
+        current = trader
+        if current is None:
+            continue
+        try:
+            # Outlive the interval so a slow exchange never leaves a gap
+            cached_fetch(
+                (current, "positions"),
+                REFRESH_INTERVAL + POSITIONS_TTL,
+                current.get_open_positions,
+                refresh=True,
+            )
+        except Exception as e:
+            log.warning("Error refreshing positions: %s", e)
+
+
+def start_refresher():
+    """Start the background positions refresher once per process"""
+    global _refresher
+    with _background_lock:
+        if _refresher is None:
+            _refresher = threading.Thread(
+                target=refresh_positions, name="positions-refresher", daemon=True
+            )
+            _refresher.start()
+
+
+def start_order_poller():
+    """Start the background order checker once per process"""
+    global _order_poller
+    with _background_lock:
+        if _order_poller is None:
+            _order_poller = threading.Thread(
+                target=poll_orders, name="order-poller", daemon=True
+            )
+            _order_poller.start()
 
 
 @app.route("/")
 def index():
-    if trader is None:
+    current = trader
+    if current is None:
         return redirect(url_for("setup"))
 
     # Start monitoring if not already active
-    if not trader.monitoring_active:
-        trader.start_monitoring()
+    if not current.monitoring_active:
+        current.start_monitoring()
 
-    try:
-        status = trader.get_trading_status()
-        positions = trader.get_open_positions()
-
-        # Create forms
-        trade_form = TradeForm()
-        close_form = ClosePositionForm()
-        pnl_form = PnLForm()
-
-        return render_template(
-            "index.html",
-            status=status,
-            positions=positions,
-            trade_form=trade_form,
-            close_form=close_form,
-            pnl_form=pnl_form,
-        )
-    except Exception as e:
-        return handle_error("Dashboard Error", str(e), traceback.format_exc())
+    # Failures here are rendered by the app-wide exception handler.
+    # A cold positions read waits on the exchange, so overlap it with status.
+    positions_future = _pool.submit(cached_positions, current)
+    status = cached_status(current)
+    positions = positions_future.result()
+
+    return render_template(
+        "index.html",
+        status=status,
+        positions=positions,
+        trade_form=TRADE_FORM,
+        close_form=CLOSE_FORM,
+        pnl_form=PNL_FORM,
+    )
 
 
 @app.route("/setup", methods=["GET", "POST"])
@@ -144,7 +473,16 @@ def setup():
         config_path = request.form.get("config_path", "trader_config.json")
 
         try:
-            trader = CryptoFuturesTrader(exchange_id, api_key, secret_key, config_path)
+            new_trader = CryptoFuturesTrader(
+                exchange_id, api_key, secret_key, config_path
+            )
+            new_trader.connect()
+            # Have the market list ready before the dashboard asks for it
+            markets_payload(new_trader)
+            trader = new_trader
+            clear_exchange_cache()
+            start_order_poller()
+            start_refresher()
             flash("Successfully connected to exchange!", "success")
             return redirect(url_for("index"))
         except Exception as e:
@@ -155,7 +493,8 @@ def setup():
 
 @app.route("/trade", methods=["POST"])
 def place_trade():
-    if trader is None:
+    current = trader
+    if current is None:
         return redirect(url_for("setup"))
 
     try:
@@ -169,32 +508,32 @@ def place_trade():
         price = None
         # Only use price for limit orders
         if order_type == "limit":
-            if request.form.get("price") and request.form["price"].strip():
-                price = float(request.form["price"])
-            else:
+            price = optional_float(request.form, "price")
+            if price is None:
                 flash("Limit orders require a price", "danger")
                 return redirect(url_for("index"))
 
         # Other parameters
-        stop_loss = None
-        if request.form.get("stop_loss") and request.form["stop_loss"].strip():
-            stop_loss = float(request.form["stop_loss"])
-
-        take_profit = None
-        if request.form.get("take_profit") and request.form["take_profit"].strip():
-            take_profit = float(request.form["take_profit"])
+        stop_loss = optional_float(request.form, "stop_loss")
+        take_profit = optional_float(request.form, "take_profit")
 
         leverage = int(request.form.get("leverage", 5))
         margin_mode = request.form.get("margin_mode", "isolated")
         post_only = "post_only" in request.form
 
-        # Debug output
-        print(
-            f"Order request: Type={order_type}, Symbol={symbol}, Side={side}, Amount={amount}, Price={price}, SL={stop_loss}, TP={take_profit}"
+        log.debug(
+            "Order request: Type=%s, Symbol=%s, Side=%s, Amount=%s, Price=%s, SL=%s, TP=%s",
+            order_type,
+            symbol,
+            side,
+            amount,
+            price,
+            stop_loss,
+            take_profit,
         )
 
         # Place the trade
-        result = trader.place_trade(
+        result = current.place_trade(
             symbol=symbol,
             side=side,
             amount=amount,
@@ -205,6 +544,7 @@ def place_trade():
             margin_mode=margin_mode,
             post_only=post_only,
         )
+        clear_exchange_cache()
 
         if result["success"]:
             flash(f"Trade successful: {result['message']}", "success")
@@ -214,43 +554,148 @@ def place_trade():
     except ValueError as e:
         flash(f"Invalid input: {str(e)}", "danger")
     except Exception as e:
-        return handle_error("Trade Error", str(e), traceback.format_exc())
+        return handle_error("Trade Error", str(e), debug_details())
 
     return redirect(url_for("index"))
 
 
 @app.route("/close", methods=["POST"])
 def close_position():
-    if trader is None:
+    current = trader
+    if current is None:
         return redirect(url_for("setup"))
 
+    if rate_limited(current):
+        flash("Exchange rate limit reached; try closing again in a moment", "warning")
+        return redirect(url_for("index"))
+
     try:
-        symbol = request.form["symbol"]
-        result = trader.close_position(symbol)
+        symbol = request.form["symbol"].strip().upper()
+        if not valid_symbol(symbol):
+            flash(f"Invalid symbol: {symbol!r}", "danger")
+            return redirect(url_for("index"))
+        result = current.close_position(symbol)
+        clear_exchange_cache()
 
         if result["success"]:
             flash(f"Position closed: {result['message']}", "success")
         else:
             flash(f"Failed to close position: {result['message']}", "danger")
     except Exception as e:
-        return handle_error("Close Position Error", str(e), traceback.format_exc())
+        return handle_error("Close Position Error", str(e), debug_details())
 
     return redirect(url_for("index"))
 
 
+# Shape of a symbol the dashboard can trade: BTC, BTCUSDT, BTC/USDT,
+# BTC-USDT, BTC/USDT:USDT or a dated future such as BTC/USDT:USDT-250328.
+# Anything else is refused before the exchange is asked about it.
+SYMBOL_RE = re.compile(
+    r"^[A-Z0-9]{1,20}(?:[/-]?[A-Z0-9]{2,10})?(?::[A-Z0-9]{2,10})?(?:-\d{6})?$"
+)
+
+
+def valid_symbol(symbol):
+    return isinstance(symbol, str) and SYMBOL_RE.match(symbol) is not None
+
+
+# Most positions /close_positions closes at once; the threads stay warm
+# between batches so a risk-off burst doesn't start by spawning them
+MAX_PARALLEL_CLOSES = 10
+_close_pool = ThreadPoolExecutor(
+    max_workers=MAX_PARALLEL_CLOSES, thread_name_prefix="close"
+)
+# Refuse a close rather than hold a request thread when the exchange rate
+# limit is already this many seconds behind
+CLOSE_MAX_WAIT = 2.0
+
+
+def rate_limited(current):
+    """True if the rate limiter's backlog is already past CLOSE_MAX_WAIT
+
+    Only requests already queued count: a batch's own size never refuses
+    it, since its closes are paced by the limiter once admitted.
+    """
+    return current.api_wait() > CLOSE_MAX_WAIT
+
+
+def close_result(current, symbol, positions=None):
+    """Close one position and summarize the outcome for a JSON response"""
+    try:
+        result = current.close_position(symbol, positions=positions)
+    except Exception as e:
+        result = {"success": False, "message": str(e)}
+    return {
+        "symbol": symbol,
+        "success": result["success"],
+        "message": result["message"],
+    }
+
+
+@app.route("/close_positions", methods=["POST"])
+def close_positions():
+    """Close several positions at once; body: {"symbols": ["BTC/USDT", ...]}"""
+    current = trader
+    if current is None:
+        return jsonify({"error": "Not connected to exchange"}), 400
+
+    data = request.get_json(silent=True)
+    symbols = data.get("symbols") if isinstance(data, dict) else None
+    if not isinstance(symbols, list) or not all(
+        isinstance(symbol, str) for symbol in symbols
+    ):
+        return jsonify({"error": 'Expected {"symbols": [...]}'}), 400
+    symbols = [symbol.strip().upper() for symbol in symbols]
+    invalid = [symbol for symbol in symbols if not valid_symbol(symbol)]
+    if invalid:
+        return jsonify({"error": "Invalid symbols", "symbols": invalid}), 400
+
+    # Close each symbol once, side by side, in the order given
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return jsonify({"responses": []})
+    if rate_limited(current):
+        response = jsonify({"error": "Exchange rate limit reached, retry shortly"})
+        response.headers["Retry-After"] = str(int(CLOSE_MAX_WAIT))
+        return response, 503
+    # One positions fetch serves every close; if it fails, let each close
+    # look for itself
+    try:
+        positions = current.get_open_positions(raise_errors=True)
+    except Exception as e:
+        log.warning("Batch close positions fetch failed: %s", e)
+        positions = None
+
+    # Index them once so each close is handed just its own position. A
+    # symbol the successful fetch doesn't list has no open position.
+    by_symbol = {current.normalize_symbol(p.get("symbol")): p for p in positions or []}
+
+    def close(symbol):
+        if positions is None:
+            return close_result(current, symbol)
+        match = by_symbol.get(current.normalize_symbol(symbol))
+        return close_result(current, symbol, [match] if match else [])
+
+    responses = list(_close_pool.map(close, symbols))
+    clear_exchange_cache()
+    return jsonify({"responses": responses})
+
+
 @app.route("/pnl", methods=["POST"])
 def update_pnl():
-    if trader is None:
+    current = trader
+    if current is None:
         return redirect(url_for("setup"))
 
     try:
         amount = float(request.form["amount"])
-        trader.update_pnl(amount)
+        current.update_pnl(amount)
+        clear_exchange_cache()
         flash(f"PnL updated: ${amount}", "success")
     except ValueError:
         flash("Please enter a valid number for PnL", "danger")
     except Exception as e:
-        return handle_error("PnL Update Error", str(e), traceback.format_exc())
+        return handle_error("PnL Update Error", str(e), debug_details())
 
     return redirect(url_for("index"))
 
@@ -258,64 +703,52 @@ def update_pnl():
 @app.route("/api/markets", methods=["GET"])
 def get_markets():
     """API endpoint to get available markets for the selected exchange"""
-    if trader is None:
+    current = trader
+    if current is None:
         return jsonify({"error": "Not connected to exchange"}), 400
 
     try:
-        # Ensure markets are loaded
-        if not trader.exchange.markets:
-            trader.exchange.load_markets()
-
-        # Get all futures markets
-        markets = []
-        for symbol, market in trader.exchange.markets.items():
-            if market.get("type") == "swap" or market.get("type") == "future":
-                markets.append(
-                    {
-                        "symbol": symbol,
-                        "base": market.get("base"),
-                        "quote": market.get("quote"),
-                        "type": market.get("type"),
-                    }
-                )
-
-        return jsonify({"markets": markets})
+        return conditional(json_response(markets_payload(current)), MARKETS_MAX_AGE)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
-@app.route("/api/ticker/<path:symbol>", methods=["GET"])
-def get_ticker(symbol):
-    """API endpoint to get current ticker data for a symbol"""
-    if trader is None:
-        return jsonify({"error": "Not connected to exchange"}), 400
+def markets_payload(current):
+    """Encoded /api/markets body, rebuilt only when the trader reloads markets"""
+    global _markets_payload
+    # Futures markets are listed once per markets load by the trader,
+    # and encoded once per list
+    markets = current.futures_markets()
+    if _markets_payload[0] is not markets:
+        _markets_payload = (markets, encode_json({"markets": markets}))
+    return _markets_payload[1]
 
-    try:
-        # Format the symbol properly for the exchange
-        print(f"Original symbol from request: {symbol}")
 
-        # Try to use the trader's format_symbol_for_exchange if available
-        try:
-            formatted_symbol = trader.format_symbol_for_exchange(symbol)
-            print(f"Formatted symbol using trader method: {formatted_symbol}")
-        except Exception as format_error:
-            print(f"Error formatting symbol: {format_error}")
-            formatted_symbol = symbol
-            # Try basic formatting if the trader method fails
-            if "/" not in formatted_symbol and "USDT" in formatted_symbol.upper():
-                # Convert BTCUSDT to BTC/USDT format if needed
-                formatted_symbol = formatted_symbol.replace("USDT", "/USDT")
-                print(f"Basic formatting applied: {formatted_symbol}")
-
-        print(f"Attempting to fetch ticker for symbol: {formatted_symbol}")
-
-        # Try to fetch the ticker data
-        ticker = trader.exchange.fetch_ticker(formatted_symbol)
-
-        print(f"Ticker data received: {ticker}")
-
-        # Return the ticker data
-        return jsonify(
+def format_ticker_symbol(current, symbol):
+    """Exchange form of a symbol typed into the dashboard"""
+    try:
+        formatted_symbol = current.format_symbol_for_exchange(symbol)
+        log.debug("Formatted symbol using trader method: %s", formatted_symbol)
+    except Exception as format_error:
+        log.warning("Error formatting symbol: %s", format_error)
+        formatted_symbol = symbol
+        # Try basic formatting if the trader method fails
+        if "/" not in formatted_symbol and "USDT" in formatted_symbol.upper():
+            # Convert BTCUSDT to BTC/USDT format if needed
+            formatted_symbol = formatted_symbol.replace("USDT", "/USDT")
+            log.debug("Basic formatting applied: %s", formatted_symbol)
+    return formatted_symbol
+
+
+def ticker_payload(current, symbol):
+    """Encoded ticker body for a symbol, shared by all clients for TICKER_TTL"""
+    formatted_symbol = format_ticker_symbol(current, symbol)
+
+    def fetch():
+        log.debug("Attempting to fetch ticker for symbol: %s", formatted_symbol)
+        ticker = current.fetch_ticker(formatted_symbol)
+        log.debug("Ticker data received: %s", ticker)
+        return encode_json(
             {
                 "symbol": symbol,
                 "formatted_symbol": formatted_symbol,
@@ -326,24 +759,75 @@ def get_ticker(symbol):
                 "low": ticker.get("low"),
             }
         )
+
+    return cached_fetch((current, "ticker", symbol), TICKER_TTL, fetch)
+
+
+@app.route("/api/ticker/<path:symbol>", methods=["GET"])
+def get_ticker(symbol):
+    """API endpoint to get current ticker data for a symbol"""
+    current = trader
+    if current is None:
+        return jsonify({"error": "Not connected to exchange"}), 400
+
+    try:
+        log.debug("Original symbol from request: %s", symbol)
+        # Return the ticker data; repeat hits reuse the encoded response
+        return json_response(ticker_payload(current, symbol))
     except Exception as e:
-        import traceback
+        log.warning("Error fetching ticker: %s", e)
+        error = {"error": str(e)}
+        if app.debug:
+            error["details"] = traceback.format_exc()
+            log.debug("Traceback: %s", error["details"])
+        return jsonify(error), 500
+
+
+@app.route("/sse/ticker/<path:symbol>", methods=["GET"])
+def stream_ticker(symbol):
+    """Push ticker updates as Server-Sent Events instead of client polling"""
+    current = trader
+    if current is None:
+        return jsonify({"error": "Not connected to exchange"}), 400
 
-        error_details = traceback.format_exc()
-        print(f"Error fetching ticker: {e}")
-        print(f"Traceback: {error_details}")
-        return jsonify({"error": str(e), "details": error_details}), 500
+    return event_stream(lambda: ticker_payload(current, symbol), TICKER_TTL)
+
+
+@app.route("/api/stream", methods=["GET"])
+def stream_dashboard():
+    """Push status, positions and pending orders as Server-Sent Events"""
+    current = trader
+    if current is None:
+        return jsonify({"error": "Not connected to exchange"}), 400
+
+    def read():
+        # Leave out the status clock so only real changes trigger a push
+        status = {k: v for k, v in cached_status(current).items() if k != "date"}
+        return encode_json(
+            {
+                "status": status,
+                "positions": cached_positions(current),
+                "pending": current.get_pending_orders(),
+            }
+        )
+
+    return event_stream(read, STATUS_TTL)
 
 
 @app.route("/api/status", methods=["GET"])
 def get_status():
     """API endpoint to get current trading status"""
-    if trader is None:
+    current = trader
+    if current is None:
         return jsonify({"error": "Not connected to exchange"}), 400
 
     try:
-        status = trader.get_trading_status()
-        return jsonify(status)
+        payload = cached_fetch(
+            (current, "status.json"),
+            STATUS_TTL,
+            lambda: encode_json(cached_status(current)),
+        )
+        return conditional(json_response(payload), STATUS_MAX_AGE)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -351,25 +835,78 @@ def get_status():
 @app.route("/api/positions", methods=["GET"])
 def get_positions():
     """API endpoint to get current open positions"""
-    if trader is None:
+    current = trader
+    if current is None:
         return jsonify({"error": "Not connected to exchange"}), 400
 
     try:
-        positions = trader.get_open_positions()
-        return jsonify({"positions": positions})
+        payload = cached_fetch(
+            (current, "positions.json"),
+            POSITIONS_TTL,
+            lambda: encode_json({"positions": cached_positions(current)}),
+        )
+        return conditional(json_response(payload), int(POSITIONS_TTL))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+# Read-only calls /api/batch can answer in one round trip
+BATCH_METHODS = {
+    "status": cached_status,
+    "positions": cached_positions,
+    "pending": lambda current: current.get_pending_orders(),
+    "monitoring": lambda current: current.get_monitoring_status(),
+}
+
+
+@app.route("/api/batch", methods=["POST"])
+def batch():
+    """API endpoint answering several read calls in one request.
+
+    Body: [{"method": "status", "id": 1}, {"method": "positions"}, ...]
+    Each entry gets {"id", "result"} or {"id", "error"}, in order.
+    """
+    current = trader
+    if current is None:
+        return jsonify({"error": "Not connected to exchange"}), 400
+
+    calls = request.get_json(silent=True)
+    if not isinstance(calls, list):
+        return jsonify({"error": "Expected a JSON list of calls"}), 400
+
+    # Run the calls side by side; duplicates share one fetch via cached_fetch
+    pending = []
+    for call in calls:
+        if not isinstance(call, dict):
+            call = {}
+        method = call.get("method")
+        handler = BATCH_METHODS.get(method)
+        future = _pool.submit(handler, current) if handler else None
+        pending.append(({"id": call.get("id")}, method, future))
+
+    results = []
+    for entry, method, future in pending:
+        if future is None:
+            entry["error"] = f"Unknown method: {method}"
+        else:
+            try:
+                entry["result"] = future.result()
+            except Exception as e:
+                entry["error"] = str(e)
+        results.append(entry)
+    return jsonify(results)
+
+
 @app.route("/api/leverage/<symbol>", methods=["POST"])
 def set_leverage(symbol):
     """API endpoint to set leverage for a symbol"""
-    if trader is None:
+    current = trader
+    if current is None:
         return jsonify({"error": "Not connected to exchange"}), 400
 
     try:
         leverage = int(request.json.get("leverage", 5))
-        result = trader.exchange.set_leverage(leverage, symbol)
+        result = current.set_leverage(symbol, leverage)
         return jsonify({"success": True, "result": result})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -378,37 +915,75 @@ def set_leverage(symbol):
 @app.route("/api/margin_mode/<symbol>", methods=["POST"])
 def set_margin_mode(symbol):
     """API endpoint to set margin mode for a symbol"""
-    if trader is None:
+    current = trader
+    if current is None:
         return jsonify({"error": "Not connected to exchange"}), 400
 
     try:
         margin_mode = request.json.get("margin_mode", "isolated")
-        result = trader.exchange.set_margin_mode(margin_mode, symbol)
+        result = current.set_margin_mode(symbol, margin_mode)
         return jsonify({"success": True, "result": result})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @app.route("/api/history", methods=["GET"])
+@app.route("/api/trades", methods=["GET"])
 def get_trade_history():
-    """API endpoint to get trade history"""
-    if trader is None:
+    """API endpoint to get trade history, optionally paged with limit/offset"""
+    current = trader
+    if current is None:
         return jsonify({"error": "Not connected to exchange"}), 400
 
     try:
-        return jsonify({"trades": trader.trades_history})
+        trades = current.trades_history
+        offset = request.args.get("offset", 0, type=int)
+        limit = request.args.get("limit", type=int)
+        if offset or limit is not None:
+            end = None if limit is None else offset + limit
+            response = jsonify(
+                {"trades": trades[offset:end], "total": len(trades), "offset": offset}
+            )
+            return conditional(response, STATUS_MAX_AGE)
+
+        # The full history is re-encoded only after the trader changes it
+        global _history_payload
+        version = (current, current.history_version)
+        if _history_payload[0] != version:
+            body = encode_json({"trades": trades, "total": len(trades), "offset": 0})
+            _history_payload = (version, body)
+        return conditional(json_response(_history_payload[1]), STATUS_MAX_AGE)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/trades/stream", methods=["GET"])
+def stream_trade_history():
+    """API endpoint streaming trade history as newline-delimited JSON"""
+    current = trader
+    if current is None:
+        return jsonify({"error": "Not connected to exchange"}), 400
+
+    # Snapshot the list so trades placed mid-stream don't shift the iteration
+    trades = list(current.trades_history)
+
+    def generate():
+        for trade in trades:
+            yield encode_json(trade) + b"\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
 @app.route("/check_orders", methods=["GET"])
 def check_orders():
     """Check status of pending limit orders"""
-    if trader is None:
+    current = trader
+    if current is None:
         return redirect(url_for("setup"))
 
     try:
-        result = trader.check_limit_order_status()
+        result = current.check_limit_order_status()
+        clear_exchange_cache()
         if result.get("updated"):
             flash(f"Updated status of {len(result['updated'])} orders", "success")
         else:
@@ -422,17 +997,19 @@ def check_orders():
 @app.route("/cancel_order", methods=["POST"])
 def cancel_order():
     """Cancel a pending order"""
-    if trader is None:
+    current = trader
+    if current is None:
         return redirect(url_for("setup"))
 
     try:
         order_id = request.form["order_id"]
 
         # Attempt to cancel the order with the exchange
-        result = trader.exchange.cancel_order(order_id)
+        result = current.cancel_order(order_id)
 
         # Update our internal state to mark it canceled
-        trader.update_order_status(order_id, "canceled")
+        current.update_order_status(order_id, "canceled")
+        clear_exchange_cache()
 
         flash(f"Order canceled successfully", "success")
     except Exception as e:
@@ -444,11 +1021,12 @@ def cancel_order():
 @app.route("/api/monitoring_status", methods=["GET"])
 def monitoring_status():
     """Get monitoring system status"""
-    if trader is None:
+    current = trader
+    if current is None:
         return jsonify({"error": "Not connected to exchange"}), 400
 
     try:
-        status = trader.get_monitoring_status()
+        status = current.get_monitoring_status()
         return jsonify(status)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -457,11 +1035,12 @@ def monitoring_status():
 @app.route("/api/debug_monitors", methods=["GET"])
 def debug_monitors():
     """Debug monitoring system"""
-    if trader is None:
+    current = trader
+    if current is None:
         return jsonify({"error": "Not connected to exchange"}), 400
 
     try:
-        monitors = trader.debug_monitors()
+        monitors = current.debug_monitors()
         return jsonify({"monitors": monitors})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -470,13 +1049,43 @@ def debug_monitors():
 @app.errorhandler(404)
 def page_not_found(e):
     """Handle 404 errors"""
-    return handle_error("Page Not Found", "The requested page could not be found.")
+    return fixed_error_page(
+        "Page Not Found", "The requested page could not be found.", 404
+    )
 
 
 @app.errorhandler(500)
 def server_error(e):
     """Handle 500 errors"""
-    return handle_error("Server Error", "An internal server error occurred.")
+    return fixed_error_page("Server Error", "An internal server error occurred.", 500)
+
+
+@app.errorhandler(Exception)
+def unhandled_exception(e):
+    """Render any exception a route didn't handle itself"""
+    if isinstance(e, HTTPException):
+        return e
+    details = None
+    if app.debug:
+        details = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+    return handle_error("Server Error", str(e), details)
+
+
+@lru_cache(maxsize=16)
+def render_fixed_error(title, message, show_setup_button, script_root):
+    """error.html for a fixed message; script_root keys the url_for links"""
+    return render_template(
+        "error.html",
+        error_title=title,
+        error_message=message,
+        show_setup_button=show_setup_button,
+    )
+
+
+def fixed_error_page(title, message, status):
+    """Error page whose text never changes, rendered once and then reused"""
+    body = render_fixed_error(title, message, trader is None, request.script_root)
+    return body, status
 
 
 def handle_error(title, message, details=None):
@@ -492,6 +1101,8 @@ def handle_error(title, message, details=None):
 
 
 def main():
+    global ORDER_CHECK_INTERVAL
+
     parser = argparse.ArgumentParser(
         description="Web interface for Crypto Futures Trader"
     )
@@ -500,11 +1111,30 @@ def main():
     )
     parser.add_argument("--port", type=int, default=5000, help="Port to bind")
     parser.add_argument("--debug", action="store_true", help="Run in debug mode")
+    parser.add_argument(
+        "--order-check-interval",
+        type=float,
+        default=ORDER_CHECK_INTERVAL,
+        help="Seconds between checks of pending limit orders",
+    )
 
     args = parser.parse_args()
 
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    ORDER_CHECK_INTERVAL = args.order_check_interval
+
+    # Compile the templates before the first request needs them
+    for template in ("index.html", "setup.html", "error.html"):
+        app.jinja_env.get_template(template)
+
     try:
-        app.run(host=args.host, port=args.port, debug=args.debug)
+        # One process, one thread per request: the trader and its state are
+        # process-global, so requests share them rather than forking workers
+        app.run(host=args.host, port=args.port, debug=args.debug, threaded=True)
     except Exception as e:
         print(f"Error starting application: {e}")
         traceback.print_exc()
@@ -0,0 +1,13 @@
+"""WSGI entry point for serving the web interface from a production server.
+
+    gunicorn -w 1 -k gthread --threads 8 --timeout 0 wsgi:app
+
+Keep a single worker: the trader, its state journal and the position
+monitors live in the process, so extra workers would each run their own
+copy against the same account. Threads give the concurrency; --timeout 0
+lets the Server-Sent Events streams stay open. Each stream holds one of
+the threads until it closes itself after SSE_MAX_AGE and the browser
+reconnects, so size --threads above the number of open dashboard tabs.
+"""
+
+from web_interface import app  # noqa: F401